@@ -22,9 +22,23 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from main import Base
+from models import Base
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The spatial index is dialect-specific (SQLite R*Tree and its shadow tables,
+    # or a B-tree elsewhere) and is managed by hand in migrations.
+    if type_ == "table" and name.startswith("ct_scan_centers_rtree"):
+        return False
+    if type_ == "index" and name == "ix_ct_scan_centers_latitude_longitude":
+        return False
+    return True
+
+
+def _database_url() -> str:
+    return os.getenv("DATABASE_URL") or config.get_main_option("sqlalchemy.url")
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -43,10 +57,11 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = config.get_main_option("sqlalchemy.url")
+    url = _database_url()
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -62,15 +77,25 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # The application passes its own connection (see database.run_migrations).
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    section = config.get_section(config.config_ini_section, {})
+    section["sqlalchemy.url"] = _database_url()
     connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
+        section,
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
     )
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,78 @@
+"""Center coordinates and spatial index
+
+Adds latitude/longitude to ct_scan_centers. On SQLite the coordinates are
+mirrored into an R*Tree virtual table by triggers, so bounding-box and
+"nearby" queries never scan the table; other databases get a
+(latitude, longitude) B-tree index instead.
+
+Revision ID: 6e2b9f4d8c17
+Revises: d5f08a3c61e4
+Create Date: 2026-10-19 11:48:05.217664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b9f4d8c17'
+down_revision: Union[str, Sequence[str], None] = 'd5f08a3c61e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_RTREE = [
+    "CREATE VIRTUAL TABLE ct_scan_centers_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)",
+    """
+    CREATE TRIGGER ct_scan_centers_rtree_insert AFTER INSERT ON ct_scan_centers
+    WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+    BEGIN
+        INSERT INTO ct_scan_centers_rtree VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+    END
+    """,
+    """
+    CREATE TRIGGER ct_scan_centers_rtree_update AFTER UPDATE OF latitude, longitude ON ct_scan_centers
+    BEGIN
+        DELETE FROM ct_scan_centers_rtree WHERE id = OLD.id;
+        INSERT INTO ct_scan_centers_rtree
+        SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+        WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER ct_scan_centers_rtree_delete AFTER DELETE ON ct_scan_centers
+    BEGIN
+        DELETE FROM ct_scan_centers_rtree WHERE id = OLD.id;
+    END
+    """,
+    """
+    INSERT INTO ct_scan_centers_rtree
+    SELECT id, latitude, latitude, longitude, longitude FROM ct_scan_centers
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+    """,
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ct_scan_centers', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('ct_scan_centers', sa.Column('longitude', sa.Float(), nullable=True))
+    if op.get_context().dialect.name == 'sqlite':
+        for statement in SQLITE_RTREE:
+            op.execute(statement)
+    else:
+        op.create_index('ix_ct_scan_centers_latitude_longitude', 'ct_scan_centers', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name == 'sqlite':
+        for trigger in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS ct_scan_centers_rtree_{trigger}")
+        op.execute("DROP TABLE IF EXISTS ct_scan_centers_rtree")
+    else:
+        op.drop_index('ix_ct_scan_centers_latitude_longitude', table_name='ct_scan_centers')
+    with op.batch_alter_table('ct_scan_centers') as batch_op:
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
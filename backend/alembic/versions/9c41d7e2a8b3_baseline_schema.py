@@ -0,0 +1,102 @@
+"""Baseline schema
+
+Creates the tables that used to be created by Base.metadata.create_all and
+adds the columns that ensure_database_columns() / update_db_schema.py used to
+ALTER into older SQLite databases. Every step checks the live schema first, so
+the revision applies cleanly to both fresh and pre-Alembic databases.
+
+Revision ID: 9c41d7e2a8b3
+Revises: 4b2a2d169c5f
+Create Date: 2026-10-19 10:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d7e2a8b3'
+down_revision: Union[str, Sequence[str], None] = '4b2a2d169c5f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _added_center_columns() -> list:
+    """Columns introduced after the first release of ct_scan_centers."""
+    return [
+        sa.Column('notes', sa.Text(), server_default='', nullable=True),
+        sa.Column('stored_state', sa.String(), nullable=True),
+        sa.Column('existing_client', sa.Boolean(), server_default=sa.false(), nullable=True),
+        sa.Column('not_to_pursue', sa.Boolean(), server_default=sa.false(), nullable=True),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if context.is_offline_mode():
+        tables = set()
+    else:
+        inspector = sa.inspect(op.get_bind())
+        tables = set(inspector.get_table_names())
+
+    if 'uploaded_files' not in tables:
+        op.create_table(
+            'uploaded_files',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('filename', sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(op.f('ix_uploaded_files_id'), 'uploaded_files', ['id'], unique=False)
+        op.create_index(op.f('ix_uploaded_files_filename'), 'uploaded_files', ['filename'], unique=True)
+
+    if 'ct_scan_centers' not in tables:
+        op.create_table(
+            'ct_scan_centers',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('center_name', sa.String(), nullable=True),
+            sa.Column('address', sa.String(), nullable=True),
+            sa.Column('contact_details', sa.String(), nullable=True),
+            sa.Column('google_maps_link', sa.String(), nullable=True),
+            sa.Column('city', sa.String(), nullable=True),
+            sa.Column('validated', sa.Boolean(), server_default=sa.false(), nullable=True),
+            sa.Column('qualified', sa.Boolean(), server_default=sa.false(), nullable=True),
+            *_added_center_columns(),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(op.f('ix_ct_scan_centers_id'), 'ct_scan_centers', ['id'], unique=False)
+        op.create_index(op.f('ix_ct_scan_centers_center_name'), 'ct_scan_centers', ['center_name'], unique=False)
+        op.create_index(op.f('ix_ct_scan_centers_city'), 'ct_scan_centers', ['city'], unique=False)
+    else:
+        existing = {column['name'] for column in inspector.get_columns('ct_scan_centers')}
+        for column in _added_center_columns():
+            if column.name not in existing:
+                op.add_column('ct_scan_centers', column)
+        existing_indexes = {index['name'] for index in inspector.get_indexes('ct_scan_centers')}
+        for column_name in ('id', 'center_name', 'city'):
+            index_name = f'ix_ct_scan_centers_{column_name}'
+            if index_name not in existing_indexes:
+                op.create_index(index_name, 'ct_scan_centers', [column_name], unique=False)
+
+    if 'cache_generation' not in tables:
+        cache_generation = op.create_table(
+            'cache_generation',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('generation', sa.Integer(), server_default='0', nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.bulk_insert(cache_generation, [{'id': 1, 'generation': 0}])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cache_generation')
+    op.drop_index(op.f('ix_ct_scan_centers_city'), table_name='ct_scan_centers')
+    op.drop_index(op.f('ix_ct_scan_centers_center_name'), table_name='ct_scan_centers')
+    op.drop_index(op.f('ix_ct_scan_centers_id'), table_name='ct_scan_centers')
+    op.drop_table('ct_scan_centers')
+    op.drop_index(op.f('ix_uploaded_files_filename'), table_name='uploaded_files')
+    op.drop_index(op.f('ix_uploaded_files_id'), table_name='uploaded_files')
+    op.drop_table('uploaded_files')
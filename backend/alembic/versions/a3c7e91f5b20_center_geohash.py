@@ -0,0 +1,57 @@
+"""Center geohash for map clustering
+
+Adds a geohash of each center's coordinates. Map clusters group centers by a
+geohash prefix whose length follows the zoom level, so the column is indexed
+and backfilled from the existing coordinates.
+
+Revision ID: a3c7e91f5b20
+Revises: 6e2b9f4d8c17
+Create Date: 2026-10-19 12:31:57.804213
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from geo_grid import encode_geohash
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e91f5b20'
+down_revision: Union[str, Sequence[str], None] = '6e2b9f4d8c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ct_scan_centers', sa.Column('geohash', sa.String(), nullable=True))
+    op.create_index(op.f('ix_ct_scan_centers_geohash'), 'ct_scan_centers', ['geohash'], unique=False)
+    if context.is_offline_mode():
+        return
+
+    centers = sa.table(
+        'ct_scan_centers',
+        sa.column('id', sa.Integer),
+        sa.column('latitude', sa.Float),
+        sa.column('longitude', sa.Float),
+        sa.column('geohash', sa.String),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(centers.c.id, centers.c.latitude, centers.c.longitude)
+        .where(centers.c.latitude.is_not(None), centers.c.longitude.is_not(None))
+    ).all()
+    if rows:
+        bind.execute(
+            centers.update().where(centers.c.id == sa.bindparam('center_id')).values(geohash=sa.bindparam('value')),
+            [{'center_id': id_, 'value': encode_geohash(lat, lng)} for id_, lat, lng in rows],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ct_scan_centers_geohash'), table_name='ct_scan_centers')
+    with op.batch_alter_table('ct_scan_centers') as batch_op:
+        batch_op.drop_column('geohash')
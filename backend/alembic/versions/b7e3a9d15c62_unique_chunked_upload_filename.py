@@ -0,0 +1,35 @@
+"""Unique chunked upload filename
+
+A chunked upload reserves its filename when it is created, so two concurrent
+uploads of the same file cannot both ingest their rows. Duplicate rows left by
+earlier versions are dropped first, keeping one per filename.
+
+Revision ID: b7e3a9d15c62
+Revises: f41b6c2d9a83
+Create Date: 2026-10-19 21:14:05.318270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3a9d15c62'
+down_revision: Union[str, Sequence[str], None] = 'f41b6c2d9a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text(
+        "DELETE FROM chunked_uploads WHERE id NOT IN (SELECT MIN(id) FROM chunked_uploads GROUP BY filename)"
+    ))
+    op.create_index(op.f('ix_chunked_uploads_filename'), 'chunked_uploads', ['filename'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chunked_uploads_filename'), table_name='chunked_uploads')
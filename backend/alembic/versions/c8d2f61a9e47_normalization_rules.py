@@ -0,0 +1,69 @@
+"""Normalization rules
+
+Adds the normalization_rules table (state/city aliases and city -> state
+implications, see normalization.py) and seeds it with the corrections that
+used to be applied by one-off scripts, applying them to the existing rows.
+
+Revision ID: c8d2f61a9e47
+Revises: a3c7e91f5b20
+Create Date: 2026-10-19 15:02:11.418736
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2f61a9e47'
+down_revision: Union[str, Sequence[str], None] = 'a3c7e91f5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEED_RULES = [
+    {'kind': 'state_alias', 'match': 'U P', 'value': 'Uttar Pradesh'},
+    {'kind': 'city_state', 'match': 'Chhatrapati Sambhajinagar', 'value': 'Maharashtra'},
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rules = op.create_table(
+        'normalization_rules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('match', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'match', name='uq_normalization_rules_kind_match'),
+    )
+    op.bulk_insert(rules, SEED_RULES)
+    if context.is_offline_mode():
+        return
+
+    centers = sa.table(
+        'ct_scan_centers',
+        sa.column('city', sa.String),
+        sa.column('stored_state', sa.String),
+        sa.column('version', sa.Integer),
+    )
+    city_key = sa.func.lower(sa.func.trim(centers.c.city))
+    state_key = sa.func.lower(sa.func.trim(centers.c.stored_state))
+    state_unknown = sa.or_(centers.c.stored_state.is_(None), centers.c.stored_state.in_(['', 'Unknown State']))
+    bind = op.get_bind()
+    bind.execute(
+        centers.update()
+        .where(state_key == 'u p')
+        .values(stored_state='Uttar Pradesh', version=centers.c.version + 1)
+    )
+    bind.execute(
+        centers.update()
+        .where(city_key == 'chhatrapati sambhajinagar', state_unknown)
+        .values(stored_state='Maharashtra', version=centers.c.version + 1)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('normalization_rules')
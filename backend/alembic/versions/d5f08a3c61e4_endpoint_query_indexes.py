@@ -0,0 +1,35 @@
+"""Endpoint query indexes
+
+Adds the indexes the endpoint queries need so none of them falls back to a
+full table scan: address (exact-duplicate GROUP BY and per-address lookups) and
+(stored_state, city) for the state listing, /api/states and state/city bulk
+updates. tests/test_query_plans.py guards them.
+
+Revision ID: d5f08a3c61e4
+Revises: 9c41d7e2a8b3
+Create Date: 2026-10-19 11:02:17.884310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f08a3c61e4'
+down_revision: Union[str, Sequence[str], None] = '9c41d7e2a8b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_ct_scan_centers_address'), 'ct_scan_centers', ['address'], unique=False)
+    op.create_index('ix_ct_scan_centers_stored_state_city', 'ct_scan_centers', ['stored_state', 'city'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ct_scan_centers_stored_state_city', table_name='ct_scan_centers')
+    op.drop_index(op.f('ix_ct_scan_centers_address'), table_name='ct_scan_centers')
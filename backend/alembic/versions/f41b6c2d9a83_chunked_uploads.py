@@ -0,0 +1,44 @@
+"""Chunked uploads
+
+Adds the chunked_uploads table tracking resumable CSV uploads: how many bytes
+have been received and how far ingestion has got.
+
+Revision ID: f41b6c2d9a83
+Revises: c8d2f61a9e47
+Create Date: 2026-10-19 16:48:30.127904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41b6c2d9a83'
+down_revision: Union[str, Sequence[str], None] = 'c8d2f61a9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'chunked_uploads',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('received', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('ingested_offset', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('ingested_rows', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('skipped_rows', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('columns', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(), server_default='receiving', nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('chunked_uploads')
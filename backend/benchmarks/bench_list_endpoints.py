@@ -0,0 +1,80 @@
+"""
+Compares the legacy list-endpoint pipeline (ORM objects -> Pydantic validation
+-> stdlib json) with the Core/orjson fast path used by /api/centers.
+
+Usage (from the backend directory):
+    python benchmarks/bench_list_endpoints.py --rows 20000 --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_list_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+    from pydantic import TypeAdapter
+    import main as app_module
+    from main import CTScanCenter, CTScanCenterSchema, SessionLocal, encode_rows, select_centers
+
+    db = SessionLocal()
+    db.add_all(
+        CTScanCenter(
+            center_name=f"Diagnostic Centre {i}",
+            address=f"{i} Station Road, Near Bus Stand, Pune, Maharashtra 4110{i % 100:02d}, India.",
+            contact_details=f"0{9800000000 + i}",
+            google_maps_link=f"https://www.google.com/maps/search/?api=1&query=Centre+{i}",
+            city="Pune",
+            stored_state="Maharashtra",
+            notes="",
+        )
+        for i in range(args.rows)
+    )
+    db.commit()
+
+    adapter = TypeAdapter(List[CTScanCenterSchema])
+
+    def legacy():
+        centers = db.query(CTScanCenter).all()
+        validated = adapter.validate_python(centers)
+        json.dumps(adapter.dump_python(validated, mode="json")).encode("utf-8")
+        db.expunge_all()
+
+    def fast():
+        encode_rows(db.execute(select_centers()))
+
+    legacy_s = _timed(legacy, args.repeat)
+    fast_s = _timed(fast, args.repeat)
+    db.close()
+
+    print(f"rows:   {args.rows}")
+    print(f"legacy: {legacy_s * 1000:8.1f} ms")
+    print(f"fast:   {fast_s * 1000:8.1f} ms  ({legacy_s / fast_s:.1f}x faster)")
+    app_module.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+pytest-benchmark suite over a synthetic dataset (see synthetic_data.py).
+
+Run from the backend directory; results are saved under .benchmarks/ so a
+later run can be compared against them:
+    python -m pytest benchmarks --bench-rows 20000
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+# main creates its engines at import time, so point it at a scratch database first.
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='compass_bench_'), 'bench.db')}"
+os.environ.pop("GEMINI_API_KEY", None)
+
+from synthetic_data import DatasetSpec, generate_centers, location_for_address, seed_database  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-rows", type=int, default=5000, help="centers in the benchmark dataset")
+    parser.addoption(
+        "--bench-fuzzy-rows", type=int, default=400,
+        help="centers for the O(n^2) fuzzy duplicate benchmarks",
+    )
+    parser.addoption("--bench-duplicate-rate", type=float, default=0.05)
+
+
+@pytest.fixture(scope="session")
+def bench_rows(request) -> int:
+    return request.config.getoption("--bench-rows")
+
+
+@pytest.fixture(scope="session")
+def fuzzy_rows(request) -> int:
+    return request.config.getoption("--bench-fuzzy-rows")
+
+
+@pytest.fixture(scope="session")
+def make_dataset(request):
+    cache = {}
+    duplicate_rate = request.config.getoption("--bench-duplicate-rate")
+
+    def make(rows: int):
+        if rows not in cache:
+            cache[rows] = list(generate_centers(DatasetSpec(rows=rows, duplicate_rate=duplicate_rate)))
+        return cache[rows]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import main
+    return main
+
+
+@pytest.fixture(scope="session")
+def client(app_module):
+    from fastapi.testclient import TestClient
+
+    async def fake_async_location(address, use_cache=True):
+        return location_for_address(address)
+
+    async def fake_geocode_many(addresses, use_cache=True):
+        return [location_for_address(address) for address in addresses]
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(app_module, "get_location_from_address", location_for_address)
+        patch.setattr(app_module, "aget_location_from_address", fake_async_location)
+        patch.setattr(app_module, "geocode_many", fake_geocode_many)
+        with TestClient(app_module.app) as test_client:
+            yield test_client
+
+
+@pytest.fixture(scope="session")
+def reset_centers(app_module, make_dataset):
+    """Replace every center (and upload record) with a synthetic dataset of `rows` centers."""
+    from sqlalchemy import delete
+
+    def reset(rows: int = 0):
+        with app_module.SessionLocal() as db:
+            db.execute(delete(app_module.CTScanCenter))
+            db.execute(delete(app_module.UploadedFile))
+            db.commit()
+        if rows:
+            seed_database(app_module.engine, make_dataset(rows))
+        app_module.response_cache.clear()
+
+    return reset
@@ -0,0 +1,322 @@
+"""
+HTTP load test against a local uvicorn instance.
+
+Seeds a scratch SQLite database with a synthetic dataset, starts uvicorn on it
+with the offline geocoder (load_test_app.py), and lets `--users` concurrent
+virtual sales reps replay a mix of list, filter, status-toggle, edit, upload
+and duplicate-check requests for `--duration` seconds. Prints throughput and
+p50/p95/p99 latency per endpoint, and exits with status 1 when a latency SLO or
+the error-rate limit is exceeded.
+
+Usage (from the backend directory):
+    python benchmarks/load_test.py --rows 5000 --users 20 --duration 60
+    python benchmarks/load_test.py --users 50 --slo list_centers:p95=300 --slo update_status:p99=150
+    python benchmarks/load_test.py --base-url http://localhost:5050 --users 10  # an already running server
+"""
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.append(BACKEND_DIR)
+
+from synthetic_data import DatasetSpec, generate_centers, write_upload_csv  # noqa: E402
+
+STATES = ["Maharashtra", "Unknown State"]
+CITIES = ["Pune", "Mumbai", "Nagpur", "Nashik", "Sangli"]
+
+# Relative weight of each operation in the traffic mix, modelled on reps
+# browsing the dashboard and occasionally editing, uploading or checking
+# for duplicates.
+TRAFFIC_MIX = {
+    "list_centers": 20,
+    "list_fields": 15,
+    "centers_by_state": 15,
+    "states": 10,
+    "map_clusters": 5,
+    "nearby": 5,
+    "update_status": 15,
+    "patch_notes": 8,
+    "patch_address": 2,
+    "upload": 1,
+    # O(n^2) and CPU-bound: one call slows every other request down.
+    "potential_duplicates": 0.2,
+}
+
+# Default latency objectives in milliseconds; override with --slo.
+DEFAULT_SLOS = {
+    "list_centers": {"p95": 800},
+    "list_fields": {"p95": 500},
+    "centers_by_state": {"p95": 500},
+    "states": {"p95": 200},
+    "map_clusters": {"p95": 500},
+    "nearby": {"p95": 500},
+    "update_status": {"p95": 500, "p99": 1000},
+    "patch_notes": {"p95": 500, "p99": 1000},
+    "patch_address": {"p95": 800},
+    "upload": {"p95": 3000},
+    "potential_duplicates": {"p95": 60000},
+}
+
+
+class Workload:
+    """Builds and sends one request per operation name."""
+
+    def __init__(self, client: httpx.AsyncClient, center_ids: List[int], seed: int):
+        self.client = client
+        self.center_ids = center_ids
+        self.rng = random.Random(seed)
+        self.uploads = itertools.count()
+
+    async def send(self, operation: str) -> httpx.Response:
+        rng = self.rng
+        if operation == "list_centers":
+            return await self.client.get("/api/centers")
+        if operation == "list_fields":
+            return await self.client.get("/api/centers", params={"fields": "id,center_name,city,state,validated,qualified"})
+        if operation == "centers_by_state":
+            return await self.client.get(f"/api/centers-by-state/{rng.choice(STATES)}")
+        if operation == "states":
+            return await self.client.get("/api/states")
+        if operation == "map_clusters":
+            return await self.client.get("/api/map/clusters", params={"zoom": rng.randint(5, 12)})
+        if operation == "nearby":
+            return await self.client.get("/api/centers/nearby", params={"lat": 18.52, "lng": 73.85, "radius_km": 15})
+        if operation == "update_status":
+            flags = {flag: rng.random() < 0.5 for flag in ("validated", "qualified", "existing_client", "not_to_pursue")}
+            return await self.client.put(f"/api/centers/{rng.choice(self.center_ids)}/status", json=flags)
+        if operation == "patch_notes":
+            return await self.client.patch(
+                f"/api/centers/{rng.choice(self.center_ids)}", json={"notes": f"Called on {time.strftime('%H:%M:%S')}"}
+            )
+        if operation == "patch_address":
+            address = f"{rng.randint(1, 500)} FC Road, Shivajinagar, {rng.choice(CITIES)}, Maharashtra 411005, India."
+            return await self.client.patch(f"/api/centers/{rng.choice(self.center_ids)}", json={"address": address})
+        if operation == "upload":
+            buffer = io.StringIO()
+            write_upload_csv(buffer, generate_centers(DatasetSpec(rows=25, seed=rng.randint(0, 10**9))))
+            filename = f"load_{uuid.uuid4().hex}_{next(self.uploads)}.csv"
+            return await self.client.post("/api/upload", files={"file": (filename, buffer.getvalue(), "text/csv")})
+        if operation == "potential_duplicates":
+            return await self.client.get("/api/potential-duplicates")
+        raise ValueError(f"Unknown operation {operation}")
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_samples[max(0, math.ceil(fraction * len(sorted_samples)) - 1)]
+
+
+async def run_load(base_url: str, users: int, duration: float, mix: Dict[str, float], seed: int) -> Dict[str, dict]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    operations, weights = list(mix), list(mix.values())
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        center_ids = [row["id"] for row in (await client.get("/api/centers", params={"fields": "id"})).json()]
+        if not center_ids:
+            raise SystemExit("The server has no centers to work with.")
+        deadline = time.perf_counter() + duration
+
+        async def virtual_user(user: int):
+            workload = Workload(client, center_ids, seed + user)
+            while time.perf_counter() < deadline:
+                operation = workload.rng.choices(operations, weights)[0]
+                start = time.perf_counter()
+                try:
+                    response = await workload.send(operation)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                latencies[operation].append((time.perf_counter() - start) * 1000)
+                if failed:
+                    errors[operation] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user(user) for user in range(users)))
+        elapsed = time.perf_counter() - started
+
+    report = {}
+    for operation, samples in sorted(latencies.items()):
+        samples.sort()
+        report[operation] = {
+            "requests": len(samples),
+            "errors": errors[operation],
+            "throughput_rps": len(samples) / elapsed,
+            "mean_ms": statistics.fmean(samples),
+            "p50_ms": percentile(samples, 0.50),
+            "p95_ms": percentile(samples, 0.95),
+            "p99_ms": percentile(samples, 0.99),
+            "max_ms": samples[-1],
+        }
+    total = sum(len(samples) for samples in latencies.values())
+    report["_total"] = {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "throughput_rps": total / elapsed,
+        "elapsed_s": elapsed,
+    }
+    return report
+
+
+def check_slos(report: Dict[str, dict], slos: Dict[str, Dict[str, float]], max_error_rate: float) -> List[str]:
+    breaches = []
+    for operation, objectives in slos.items():
+        stats = report.get(operation)
+        if not stats:
+            continue
+        for quantile, limit in objectives.items():
+            observed = stats[f"{quantile}_ms"]
+            if observed > limit:
+                breaches.append(f"{operation} {quantile} {observed:.1f} ms > {limit:g} ms")
+    total = report["_total"]
+    if total["requests"] and total["errors"] / total["requests"] > max_error_rate:
+        breaches.append(f"error rate {total['errors'] / total['requests']:.2%} > {max_error_rate:.2%}")
+    return breaches
+
+
+def print_report(report: Dict[str, dict]) -> None:
+    header = f"{'endpoint':<22}{'reqs':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for operation, stats in report.items():
+        if operation == "_total":
+            continue
+        print(
+            f"{operation:<22}{stats['requests']:>8}{stats['errors']:>8}{stats['throughput_rps']:>9.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    total = report["_total"]
+    print("-" * len(header))
+    print(
+        f"{'total':<22}{total['requests']:>8}{total['errors']:>8}{total['throughput_rps']:>9.1f}"
+        f"   over {total['elapsed_s']:.1f}s"
+    )
+
+
+def parse_slo(value: str):
+    """"operation:p95=250" -> ("operation", "p95", 250.0)."""
+    try:
+        operation, objective = value.split(":", 1)
+        quantile, limit = objective.split("=", 1)
+        if quantile not in ("p50", "p95", "p99") or operation not in TRAFFIC_MIX:
+            raise ValueError
+        return operation, quantile, float(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected <operation>:<p50|p95|p99>=<ms> with an operation from: {', '.join(TRAFFIC_MIX)}"
+        )
+
+
+def start_server(rows: int, port: int, workers: int, seed: int) -> subprocess.Popen:
+    from database import create_app_engine, run_migrations
+    from synthetic_data import seed_database
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='compass_load_'), 'load.db')}"
+    engine = create_app_engine(database_url)
+    run_migrations(engine)
+    seed_database(engine, generate_centers(DatasetSpec(rows=rows, seed=seed)))
+    engine.dispose()
+
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=os.pathsep.join([BACKEND_DIR, BENCHMARKS_DIR]))
+    env.pop("GEMINI_API_KEY", None)
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    command = [
+        sys.executable, "-m", "uvicorn", "load_test_app:app",
+        "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/api/states", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit("uvicorn did not become ready in time")
+
+
+def main() -> Optional[int]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="centers in the seeded database")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of traffic")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--base-url", help="test an already running server instead of starting one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--slo", type=parse_slo, action="append", default=[],
+        help="latency objective such as list_centers:p95=300 (repeatable; overrides the default for that quantile)",
+    )
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--mix", type=json.loads, default=None,
+        help='JSON object of operation weights replacing the default mix, e.g. \'{"list_centers": 1}\'',
+    )
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    slos = {operation: dict(objectives) for operation, objectives in DEFAULT_SLOS.items()}
+    for operation, quantile, limit in args.slo:
+        slos.setdefault(operation, {})[quantile] = limit
+    mix = args.mix or TRAFFIC_MIX
+    unknown = set(mix) - set(TRAFFIC_MIX)
+    if unknown:
+        parser.error(f"unknown operations in --mix: {', '.join(sorted(unknown))}")
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        print(f"Seeding {args.rows} centers and starting uvicorn with {args.workers} worker(s)...")
+        server = start_server(args.rows, args.port, args.workers, args.seed)
+        base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        if server is not None:
+            wait_until_ready(base_url, server)
+        print(f"Running {args.users} users for {args.duration:g}s against {base_url}")
+        report = asyncio.run(run_load(base_url, args.users, args.duration, mix, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_report(report)
+    breaches = check_slos(report, slos, args.max_error_rate)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"report": report, "slos": slos, "breaches": breaches}, file, indent=2)
+    if breaches:
+        print("\nSLO breaches:")
+        for breach in breaches:
+            print(f"  {breach}")
+        return 1
+    print("\nAll SLOs met.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
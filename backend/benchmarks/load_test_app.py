@@ -0,0 +1,23 @@
+"""
+ASGI entry point for load tests: the real app with the Gemini geocoder replaced
+by the offline stand-in from synthetic_data, so runs cost nothing and are not
+limited by Gemini's latency or quota.
+
+    uvicorn load_test_app:app  (with backend/ and backend/benchmarks/ on PYTHONPATH)
+"""
+import main
+from main import app  # noqa: F401
+from synthetic_data import location_for_address
+
+
+async def _fake_async_location(address, use_cache=True):
+    return location_for_address(address)
+
+
+async def _fake_geocode_many(addresses, use_cache=True):
+    return [location_for_address(address) for address in addresses]
+
+
+main.get_location_from_address = location_for_address
+main.aget_location_from_address = _fake_async_location
+main.geocode_many = _fake_geocode_many
@@ -0,0 +1,268 @@
+"""
+Synthetic CT scan center datasets for benchmarks and load tests.
+
+Rows are assembled from the bundled CT_Scan_Results_*.csv files: cities are
+drawn in proportion to their row counts, and addresses, center names, contact
+formats and PIN codes are recombined from the real values of the same city. A
+controlled share of rows duplicates an earlier row, either exactly (same name
+and address, found by /api/deduplicate) or with small edits such as case,
+punctuation and "Road" -> "Rd" (found by /api/potential-duplicates).
+
+Usage (from the backend directory):
+    python benchmarks/synthetic_data.py --rows 100000 --csv /tmp/centers.csv
+    python benchmarks/synthetic_data.py --rows 1000000 --database-url sqlite:////tmp/centers.db
+"""
+import argparse
+import csv
+import glob
+import os
+import random
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import quote_plus
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.dirname(BACKEND_DIR)
+sys.path.append(BACKEND_DIR)
+
+from city_utils import Location  # noqa: E402
+from models import center_geohash  # noqa: E402
+
+STATE = "Maharashtra"
+
+# Approximate city centres; the source files carry no coordinates.
+CITY_COORDINATES = {
+    "Aurangabad": (19.8762, 75.3433),
+    "Jalgaon": (21.0077, 75.5626),
+    "Kolhapur": (16.7050, 74.2433),
+    "Mumbai": (19.0760, 72.8777),
+    "Nagpur": (21.1458, 79.0882),
+    "Nashik": (19.9975, 73.7898),
+    "Pune": (18.5204, 73.8567),
+    "Sangli": (16.8524, 74.5815),
+}
+
+_PIN_COMPONENT = re.compile(r"^Maharashtra\s+(\d{6})$", re.IGNORECASE)
+_NAME_KEYWORDS = re.compile(
+    r"\b(diagnostics?|imaging|scan|ct|mri|hospital|centre|center|clinic|sonography|radiology|pathology|x-ray)\b",
+    re.IGNORECASE,
+)
+_FUZZY_EDITS = [
+    (r"\bRoad\b", "Rd"),
+    (r"\bRd\b", "Road"),
+    (r"\bCentre\b", "Center"),
+    (r"\bCenter\b", "Centre"),
+    (r"\bNear\b", "Nr."),
+    (r"\bOpposite\b", "Opp."),
+]
+
+
+@dataclass
+class CityProfile:
+    """Values observed for one source file."""
+    name: str
+    weight: int
+    street_parts: List[str] = field(default_factory=list)
+    towns: List[str] = field(default_factory=list)
+    pins: List[str] = field(default_factory=list)
+    part_counts: List[int] = field(default_factory=list)
+    brands: List[str] = field(default_factory=list)
+    name_tails: List[str] = field(default_factory=list)
+    contacts: List[str] = field(default_factory=list)
+
+
+def load_profiles(data_dir: str = DATA_DIR) -> List[CityProfile]:
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "CT_Scan_Results_*.csv"))):
+        city = os.path.basename(path)[len("CT_Scan_Results_"):-len(".csv")].title()
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+        profile = CityProfile(name=city, weight=len(rows))
+        for row in rows:
+            parts = [part.strip() for part in (row.get("Address") or "").split(",") if part.strip()]
+            pin_index = next((i for i, part in enumerate(parts) if _PIN_COMPONENT.match(part)), None)
+            if pin_index is not None and pin_index >= 2:
+                profile.pins.append(_PIN_COMPONENT.match(parts[pin_index]).group(1))
+                profile.towns.append(parts[pin_index - 1])
+                profile.street_parts.extend(parts[:pin_index - 1])
+                profile.part_counts.append(pin_index - 1)
+            name = (row.get("Center Name") or "").strip()
+            keyword = _NAME_KEYWORDS.search(name)
+            if keyword and keyword.start() > 0:
+                profile.brands.append(name[:keyword.start()].strip())
+                profile.name_tails.append(name[keyword.start():].strip())
+            elif name:
+                profile.brands.append(name)
+            if row.get("Contact Details"):
+                profile.contacts.append(row["Contact Details"])
+        if profile.pins and profile.brands:
+            profile.name_tails = profile.name_tails or ["Diagnostic Centre"]
+            profile.contacts = profile.contacts or ["020 0000 0000"]
+            profiles.append(profile)
+    if not profiles:
+        raise FileNotFoundError(f"No usable CT_Scan_Results_*.csv files in {data_dir}")
+    return profiles
+
+
+def _fuzzy_copy(value: str, rng: random.Random) -> str:
+    edits = [edit for edit in _FUZZY_EDITS if re.search(edit[0], value)]
+    if edits:
+        pattern, replacement = rng.choice(edits)
+        value = re.sub(pattern, replacement, value, count=1)
+    choice = rng.random()
+    if choice < 0.3:
+        value = value.upper()
+    elif choice < 0.6:
+        value = value.replace(",", "").replace(".", "")
+    return value.removesuffix(", India.").removesuffix(", India")
+
+
+@dataclass
+class DatasetSpec:
+    rows: int
+    duplicate_rate: float = 0.05
+    fuzzy_share: float = 0.5  # of the duplicates, how many are edited rather than exact
+    validated_rate: float = 0.3
+    qualified_rate: float = 0.15
+    existing_client_rate: float = 0.05
+    not_to_pursue_rate: float = 0.05
+    seed: int = 0
+
+
+def generate_centers(spec: DatasetSpec, profiles: Optional[List[CityProfile]] = None) -> Iterator[Dict]:
+    """
+    Yield `spec.rows` center dicts with CTScanCenter column names.
+
+    Generation is deterministic for a given seed. Duplicates copy one of the
+    last 10,000 rows, so memory stays bounded at any size.
+    """
+    rng = random.Random(spec.seed)
+    profiles = profiles or load_profiles()
+    weights = [profile.weight for profile in profiles]
+    recent: List[Dict] = []
+
+    for index in range(spec.rows):
+        if recent and rng.random() < spec.duplicate_rate:
+            original = rng.choice(recent)
+            center = dict(original)
+            if rng.random() < spec.fuzzy_share:
+                center["center_name"] = _fuzzy_copy(original["center_name"], rng)
+                center["address"] = _fuzzy_copy(original["address"], rng)
+            yield center
+            continue
+
+        profile = rng.choices(profiles, weights)[0]
+        street = rng.sample(profile.street_parts, min(rng.choice(profile.part_counts), len(profile.street_parts)))
+        if rng.random() < 0.5:
+            street.insert(0, f"Shop No. {rng.randint(1, 400)}")
+        address = ", ".join(street + [rng.choice(profile.towns), f"{STATE} {rng.choice(profile.pins)}"]) + ", India."
+        name = f"{rng.choice(profile.brands)} {rng.choice(profile.name_tails)}".strip()
+        contact = re.sub(r"\d", lambda _: str(rng.randint(0, 9)), rng.choice(profile.contacts))
+        base_lat, base_lng = CITY_COORDINATES.get(profile.name, (19.0, 75.0))
+        latitude, longitude = base_lat + rng.gauss(0, 0.04), base_lng + rng.gauss(0, 0.04)
+        center = {
+            "center_name": name,
+            "address": address,
+            "contact_details": contact,
+            "google_maps_link": f"https://www.google.com/maps/search/?api=1&query={quote_plus(f'{name} {address}')}",
+            "city": profile.name,
+            "stored_state": STATE,
+            "latitude": round(latitude, 6),
+            "longitude": round(longitude, 6),
+            "geohash": center_geohash(latitude, longitude),
+            "validated": rng.random() < spec.validated_rate,
+            "qualified": rng.random() < spec.qualified_rate,
+            "existing_client": rng.random() < spec.existing_client_rate,
+            "not_to_pursue": rng.random() < spec.not_to_pursue_rate,
+            "notes": "",
+        }
+        if len(recent) < 10_000:
+            recent.append(center)
+        else:
+            recent[index % 10_000] = center
+        yield center
+
+
+def location_for_address(address: str) -> Location:
+    """Offline stand-in for the Gemini geocoder that understands synthetic addresses."""
+    for city, (latitude, longitude) in CITY_COORDINATES.items():
+        if city.lower() in (address or "").lower():
+            return Location(city, STATE, latitude, longitude)
+    return Location("Unknown", STATE if STATE.lower() in (address or "").lower() else "Unknown State")
+
+
+UPLOAD_COLUMNS = ["Center Name", "Address", "Contact Details", "Google Maps Link", "Notes"]
+
+
+def write_upload_csv(file, centers) -> int:
+    """Write centers in the /api/upload CSV format; returns the row count."""
+    writer = csv.writer(file)
+    writer.writerow(UPLOAD_COLUMNS)
+    count = 0
+    for center in centers:
+        writer.writerow([
+            center["center_name"], center["address"], center["contact_details"], center["google_maps_link"], center["notes"],
+        ])
+        count += 1
+    return count
+
+
+def seed_database(engine, centers, batch_size: int = 10_000) -> int:
+    """
+    Bulk-insert centers through Core executemany; returns the row count.
+
+    Core statements bypass the session event that bumps the cache generation,
+    so the bump is made here, in the same transaction, for workers already
+    serving the database.
+    """
+    from sqlalchemy import insert, update
+
+    from models import CacheGeneration, CTScanCenter
+
+    count = 0
+    batch = []
+    with engine.begin() as conn:
+        for center in centers:
+            batch.append(center)
+            if len(batch) == batch_size:
+                conn.execute(insert(CTScanCenter), batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            conn.execute(insert(CTScanCenter), batch)
+            count += len(batch)
+        # cache_generation holds a single row.
+        conn.execute(update(CacheGeneration).values(generation=CacheGeneration.generation + 1))
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--fuzzy-share", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--csv", help="write an uploadable CSV file")
+    target.add_argument("--database-url", help="insert into this database (migrated to the latest schema first)")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(rows=args.rows, duplicate_rate=args.duplicate_rate, fuzzy_share=args.fuzzy_share, seed=args.seed)
+    centers = generate_centers(spec)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as file:
+            count = write_upload_csv(file, centers)
+        print(f"Wrote {count} rows to {args.csv}")
+    else:
+        from database import create_app_engine, run_migrations
+
+        engine = create_app_engine(args.database_url)
+        run_migrations(engine)
+        count = seed_database(engine, centers)
+        print(f"Inserted {count} rows into {args.database_url}")
+
+
+if __name__ == "__main__":
+    main()
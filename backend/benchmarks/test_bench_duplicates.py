@@ -0,0 +1,21 @@
+def test_exact_dedupe(benchmark, client, reset_centers, bench_rows):
+    def dedupe():
+        assert client.delete("/api/deduplicate").json()["duplicates_removed"] > 0
+
+    benchmark.extra_info["rows"] = bench_rows
+    benchmark.pedantic(dedupe, setup=lambda: reset_centers(bench_rows), rounds=3)
+
+
+def test_fuzzy_duplicate_detection(benchmark, client, reset_centers, fuzzy_rows):
+    reset_centers(fuzzy_rows)
+    benchmark.extra_info["rows"] = fuzzy_rows
+    pairs = benchmark.pedantic(lambda: client.get("/api/potential-duplicates").json(), rounds=3)
+    assert pairs
+
+
+def test_fuzzy_auto_merge(benchmark, client, reset_centers, fuzzy_rows):
+    def merge():
+        assert client.post("/api/auto-merge-duplicates").json()["duplicates_merged"] > 0
+
+    benchmark.extra_info["rows"] = fuzzy_rows
+    benchmark.pedantic(merge, setup=lambda: reset_centers(fuzzy_rows), rounds=3)
@@ -0,0 +1,31 @@
+import io
+import itertools
+
+from synthetic_data import write_upload_csv
+
+
+def test_upload_csv(benchmark, client, reset_centers, make_dataset, bench_rows):
+    buffer = io.StringIO()
+    write_upload_csv(buffer, make_dataset(bench_rows))
+    body = buffer.getvalue().encode("utf-8")
+    uploads = itertools.count()
+
+    def setup():
+        reset_centers()
+        return (f"bench_{next(uploads)}.csv",), {}
+
+    def upload(filename):
+        response = client.post("/api/upload", files={"file": (filename, body, "text/csv")})
+        assert response.status_code == 200, response.text
+
+    benchmark.extra_info["rows"] = bench_rows
+    benchmark.pedantic(upload, setup=setup, rounds=3)
+
+
+def test_refresh_all_data(benchmark, client, reset_centers, bench_rows):
+    def refresh():
+        response = client.post("/api/refresh-all-data")
+        assert response.json()["total_processed"] == bench_rows
+
+    benchmark.extra_info["rows"] = bench_rows
+    benchmark.pedantic(refresh, setup=lambda: reset_centers(bench_rows), rounds=3)
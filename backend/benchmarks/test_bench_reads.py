@@ -0,0 +1,45 @@
+import pytest
+
+READS = {
+    "list_buffered": ("/api/centers", {}),
+    "list_streamed_array": ("/api/centers", {"stream": 1}),
+    "list_fields": ("/api/centers", {"fields": "id,center_name,city,state,validated"}),
+    "by_state": ("/api/centers-by-state/Maharashtra", {}),
+    "nearby": ("/api/centers/nearby", {"lat": 18.52, "lng": 73.85, "radius_km": 10}),
+    "in_bbox": ("/api/centers/in-bbox", {"bbox": "72.7,18.8,73.1,19.3"}),
+    "map_clusters": ("/api/map/clusters", {"zoom": 7}),
+    "states": ("/api/states", {}),
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def dataset(reset_centers, bench_rows):
+    reset_centers(bench_rows)
+
+
+@pytest.mark.parametrize("name", READS)
+def test_read_uncached(benchmark, client, app_module, bench_rows, name):
+    path, params = READS[name]
+
+    def setup():
+        app_module.response_cache.clear()
+        app_module._cluster_cache.clear()
+
+    def read():
+        assert client.get(path, params=params).status_code == 200
+
+    benchmark.extra_info["rows"] = bench_rows
+    benchmark.pedantic(read, setup=setup, rounds=10)
+
+
+@pytest.mark.parametrize("name", ["list_buffered", "states"])
+def test_read_cached(benchmark, client, bench_rows, name):
+    path, params = READS[name]
+    client.get(path, params=params)
+    benchmark.extra_info["rows"] = bench_rows
+    benchmark(lambda: client.get(path, params=params))
+
+
+def test_list_ndjson(benchmark, client, bench_rows):
+    benchmark.extra_info["rows"] = bench_rows
+    benchmark(lambda: client.get("/api/centers", headers={"Accept": "application/x-ndjson"}))
@@ -1,12 +1,28 @@
+import asyncio
 import os
 import re
 import json
-from typing import Tuple, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Tuple, Optional
 
+import httpx
 import requests
 
+from metrics import (
+    EXTRACTION_ESCALATIONS,
+    EXTRACTION_OUTCOMES,
+    EXTRACTION_TIER_LATENCY,
+    GEMINI_ERRORS,
+    GEMINI_LATENCY,
+    GEMINI_RATE_LIMITED,
+    GEOCODE_CACHE,
+)
+
 # A mapping of state names to their canonical form.
 _STATE_CANONICAL = {
+    "andaman and nicobar": "Andaman and Nicobar Islands",
     "andaman and nicobar islands": "Andaman and Nicobar Islands",
     "andhra pradesh": "Andhra Pradesh",
     "arunachal pradesh": "Arunachal Pradesh",
@@ -15,8 +31,13 @@ _STATE_CANONICAL = {
     "chandigarh": "Chandigarh",
     "chhattisgarh": "Chhattisgarh",
     "dadra and nagar haveli": "Dadra and Nagar Haveli",
+    "dadra and nagar haveli and daman and diu": "Dadra and Nagar Haveli and Daman and Diu",
     "daman and diu": "Daman and Diu",
     "delhi": "Delhi",
+    "delhi ncr": "Delhi",
+    "nct of delhi": "Delhi",
+    "national capital territory of delhi": "Delhi",
+    "new delhi": "Delhi",
     "goa": "Goa",
     "gujarat": "Gujarat",
     "haryana": "Haryana",
@@ -35,6 +56,7 @@ _STATE_CANONICAL = {
     "nagaland": "Nagaland",
     "odisha": "Odisha",
     "orissa": "Odisha",
+    "pondicherry": "Puducherry",
     "puducherry": "Puducherry",
     "punjab": "Punjab",
     "rajasthan": "Rajasthan",
@@ -65,72 +87,420 @@ def _normalise_state_name(candidate: str) -> str:
     cleaned = re.sub(r"(?i)\b(state|union territory|ut)\b", "", cleaned)
     cleaned = re.sub(r"[^A-Za-z\s&-]", " ", cleaned)
     cleaned = re.sub(r"\s+", " ", cleaned).strip()
-    lowered = cleaned.lower()
+    lowered = re.sub(r"\s*&\s*", " and ", cleaned.lower())
 
     if lowered in _STATE_CANONICAL:
         return _STATE_CANONICAL[lowered]
 
-    # Handle cases like "Delhi NCR" by keeping the cleaned text
+    # Keep other answers as cleaned text
     return cleaned.title() if cleaned else ""
 
 
-def get_city_and_state_from_address(address: str) -> Tuple[str, str]:
-    """
-    Extracts the city and state from a given address using the Gemini API.
+class Location(NamedTuple):
+    """City/state extracted from an address, plus approximate coordinates when known."""
+    city: str
+    state: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
-    Args:
-        address: The full address string.
 
-    Returns:
-        A tuple containing the city and state.
-        Returns ("Unknown", "Unknown State") if extraction fails.
+UNKNOWN_LOCATION = Location("Unknown", "Unknown State")
+
+# Upper bound on concurrent Gemini requests made by geocode_many().
+GEOCODER_CONCURRENCY = int(os.getenv("GEOCODER_CONCURRENCY", "8"))
+
+# Addresses resolved by Gemini, kept per process so re-uploads and repeated
+# addresses do not cost another call. Failed lookups are not cached.
+GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "10000"))
+_location_cache: "OrderedDict[str, Location]" = OrderedDict()
+_location_cache_lock = threading.Lock()
+
+
+def _cache_key(address: str) -> str:
+    return " ".join(address.lower().split())
+
+
+def _cached_location(address: str) -> Optional[Location]:
+    key = _cache_key(address)
+    with _location_cache_lock:
+        location = _location_cache.get(key)
+        if location is not None:
+            _location_cache.move_to_end(key)
+    GEOCODE_CACHE.labels("hit" if location is not None else "miss").inc()
+    return location
+
+
+def _remember_location(address: str, location: Location) -> None:
+    if location == UNKNOWN_LOCATION or GEOCODE_CACHE_SIZE <= 0:
+        return
+    key = _cache_key(address)
+    with _location_cache_lock:
+        _location_cache[key] = location
+        _location_cache.move_to_end(key)
+        while len(_location_cache) > GEOCODE_CACHE_SIZE:
+            _location_cache.popitem(last=False)
+
+
+def clear_geocode_cache() -> None:
+    with _location_cache_lock:
+        _location_cache.clear()
+
+
+def _record_gemini_error(exc: Exception) -> None:
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status == 429:
+        GEMINI_RATE_LIMITED.inc()
+    if status is not None:
+        reason = str(status)
+    else:
+        reason = "invalid_response" if isinstance(exc, ValueError) else "transport"
+    GEMINI_ERRORS.labels(reason).inc()
+
+# "@18.5204,73.8567" (place URLs) or "query=18.5204,73.8567" (search URLs).
+_MAPS_LINK_COORDINATES = re.compile(r"(?:@|query=)(-?\d{1,2}\.\d+)(?:,|%2C)\s*(-?\d{1,3}\.\d+)")
+
+
+def _valid_coordinates(latitude, longitude) -> Tuple[Optional[float], Optional[float]]:
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None, None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or (latitude == 0 and longitude == 0):
+        return None, None
+    return latitude, longitude
+
+
+def coordinates_from_maps_link(link: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """Read coordinates embedded in a Google Maps link, if it carries any."""
+    if not link:
+        return None, None
+    match = _MAPS_LINK_COORDINATES.search(link)
+    if not match:
+        return None, None
+    return _valid_coordinates(match.group(1), match.group(2))
+
+
+class ExtractionTier(NamedTuple):
+    """One model of the extraction cascade."""
+    model: str
+    thinking_budget: Optional[int] = None  # None keeps the model's default reasoning
+
+
+def _tiers_from_env() -> List[ExtractionTier]:
     """
-    if not address or not address.strip():
-        return "Unknown", "Unknown State"
+    The cascade from GEMINI_MODELS: comma-separated `model[:thinking_budget]`
+    entries, cheapest first. By default gemini-2.5-flash-lite answers with
+    reasoning disabled, and gemini-2.5-flash is only asked when that answer
+    is escalated.
+    """
+    tiers = []
+    for entry in os.getenv("GEMINI_MODELS", "gemini-2.5-flash-lite:0,gemini-2.5-flash").split(","):
+        model, _, budget = entry.strip().partition(":")
+        if model:
+            tiers.append(ExtractionTier(model, int(budget) if budget else None))
+    return tiers
+
+
+EXTRACTION_TIERS = _tiers_from_env()
+# Answers whose self-reported confidence is below this go to the next tier.
+MIN_CONFIDENCE = float(os.getenv("GEMINI_MIN_CONFIDENCE", "0.7"))
+
+_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "city": {"type": "STRING"},
+        "state": {"type": "STRING"},
+        "latitude": {"type": "NUMBER", "nullable": True},
+        "longitude": {"type": "NUMBER", "nullable": True},
+        "confidence": {"type": "NUMBER"},
+    },
+    "required": ["city", "state", "latitude", "longitude", "confidence"],
+    "propertyOrdering": ["city", "state", "latitude", "longitude", "confidence"],
+}
+
 
+class Extraction(NamedTuple):
+    location: Location
+    confidence: Optional[float] = None
+
+
+def _build_gemini_request(address: str, tier: ExtractionTier) -> Optional[Tuple[str, dict]]:
+    """Return the (url, payload) for a Gemini extraction call, or None if it cannot be made."""
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         print("GEMINI_API_KEY environment variable not set")
-        return "Unknown", "Unknown State"
+        return None
+
+    url = f"https://generativelanguage.googleapis.com/v1beta/models/{tier.model}:generateContent?key={api_key}"
+    prompt = (
+        f'Indian address: "{address}"\n'
+        "Give its city, state, approximate coordinates (null if unsure) and your confidence "
+        'from 0 to 1 in the city and state. Use "Unknown" for a city or state you cannot determine.'
+    )
+    generation_config = {
+        "temperature": 0,
+        "responseMimeType": "application/json",
+        "responseSchema": _RESPONSE_SCHEMA,
+    }
+    if tier.thinking_budget is not None:
+        generation_config["thinkingConfig"] = {"thinkingBudget": tier.thinking_budget}
+    return url, {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": generation_config}
+
+
+def _parse_gemini_response(payload: dict) -> Extraction:
+    try:
+        content = payload.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "{}")
+        result = json.loads(content)
+
+        city = (result.get("city") or "Unknown").strip()
+        state = (result.get("state") or "Unknown State").strip()
+        latitude, longitude = _valid_coordinates(result.get("latitude"), result.get("longitude"))
+        confidence = result.get("confidence")
+        confidence = float(confidence) if confidence is not None else None
+
+        # Normalize the state name for consistency
+        normalized_state = _normalise_state_name(state)
+        if city.lower() == "unknown":
+            city = ""
+
+        return Extraction(
+            Location(city or "Unknown", normalized_state or "Unknown State", latitude, longitude), confidence
+        )
+
+    except (ValueError, TypeError, IndexError, AttributeError, json.JSONDecodeError) as exc:
+        GEMINI_ERRORS.labels("invalid_response").inc()
+        print(f"Gemini API returned an invalid response: {exc}")
+        return Extraction(UNKNOWN_LOCATION)
+
+
+# First two digits of a PIN code -> the states (and union territories) it is used in.
+_PIN_PREFIX_STATES = {
+    prefix: frozenset(states)
+    for prefixes, states in [
+        ("11", {"Delhi"}),
+        ("12 13", {"Haryana", "Punjab", "Chandigarh"}),
+        ("14 15 16", {"Punjab", "Haryana", "Chandigarh"}),
+        ("17", {"Himachal Pradesh"}),
+        ("18 19", {"Jammu and Kashmir", "Ladakh"}),
+        ("20 21 22 23 24 25 26 27 28", {"Uttar Pradesh", "Uttarakhand"}),
+        ("30 31 32 33 34", {"Rajasthan"}),
+        ("36 37 38 39", {"Gujarat", "Dadra and Nagar Haveli and Daman and Diu", "Daman and Diu", "Dadra and Nagar Haveli"}),
+        ("40 41 42 43 44", {"Maharashtra", "Goa"}),
+        ("45 46 47 48", {"Madhya Pradesh", "Chhattisgarh"}),
+        ("49", {"Chhattisgarh"}),
+        ("50 51 52 53", {"Telangana", "Andhra Pradesh"}),
+        ("56 57 58 59", {"Karnataka"}),
+        ("60 61 62 63 64", {"Tamil Nadu", "Puducherry"}),
+        ("67 68 69", {"Kerala", "Lakshadweep", "Puducherry"}),
+        ("70 71 72 73 74", {"West Bengal", "Sikkim", "Andaman and Nicobar Islands"}),
+        ("75 76 77", {"Odisha"}),
+        ("78", {"Assam"}),
+        ("79", {"Arunachal Pradesh", "Assam", "Manipur", "Meghalaya", "Mizoram", "Nagaland", "Tripura"}),
+        ("80 81 82 83 84 85", {"Bihar", "Jharkhand"}),
+    ]
+    for prefix in prefixes.split()
+}
+
+_PIN_CODE = re.compile(r"(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)")
+
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
-    headers = {"Content-Type": "application/json"}
+def pin_code_states(address: str) -> Optional[frozenset]:
+    """States the last PIN code in the address belongs to, or None without a recognised PIN."""
+    matches = _PIN_CODE.findall(address or "")
+    if not matches:
+        return None
+    return _PIN_PREFIX_STATES.get(matches[-1][0][:2])
 
-    prompt = f"""
-    From the following Indian address, extract the city and state.
-    Return the response as a JSON object with two keys: "city" and "state".
-    If you cannot determine the city or state, use the value "Unknown".
 
-    Address: "{address}"
+def _escalation_reason(address: str, extraction: Extraction) -> Optional[str]:
+    location, confidence = extraction
+    if location.city == UNKNOWN_LOCATION.city or location.state == UNKNOWN_LOCATION.state:
+        return "unknown"
+    if confidence is not None and confidence < MIN_CONFIDENCE:
+        return "low_confidence"
+    states = pin_code_states(address)
+    if states is not None and location.state not in states:
+        return "pin_mismatch"
+    return None
+
+
+def _is_known(extraction: Extraction) -> bool:
+    return extraction.location.city != UNKNOWN_LOCATION.city and extraction.location.state != UNKNOWN_LOCATION.state
+
+
+def _extraction_cascade(address: str):
     """
+    Generator driving the tiers for one address, shared by the sync and async clients.
 
-    data = {
-        "contents": [{"parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "response_mime_type": "application/json",
-        },
-    }
+    It yields each tier to call and is sent back that tier's Extraction, or
+    None when the call itself failed; it returns the final Location. An answer
+    is accepted unless it is unknown, below MIN_CONFIDENCE or in a state the
+    address's PIN code does not belong to; then the next tier is asked. When
+    every tier is escalated, the last known answer wins. Failed calls (HTTP
+    errors, rate limits) are not escalated, as the next tier would usually
+    fail the same way.
+    """
+    best: Optional[Extraction] = None
+    for index, tier in enumerate(EXTRACTION_TIERS):
+        start = time.perf_counter()
+        extraction = yield tier
+        EXTRACTION_TIER_LATENCY.labels(tier.model).observe(time.perf_counter() - start)
+        if extraction is None:
+            EXTRACTION_OUTCOMES.labels(tier.model, "error").inc()
+            break
+        if best is None or _is_known(extraction) or not _is_known(best):
+            best = extraction
+        reason = _escalation_reason(address, extraction)
+        if reason is None:
+            EXTRACTION_OUTCOMES.labels(tier.model, "accepted").inc()
+            return extraction.location
+        if index == len(EXTRACTION_TIERS) - 1:
+            EXTRACTION_OUTCOMES.labels(tier.model, "exhausted").inc()
+            break
+        EXTRACTION_ESCALATIONS.labels(tier.model, reason).inc()
+    return best.location if best is not None else UNKNOWN_LOCATION
+
+
+def _call_gemini(address: str, tier: ExtractionTier) -> Optional[Extraction]:
+    request = _build_gemini_request(address, tier)
+    if request is None:
+        return None
+    url, data = request
 
+    start = time.perf_counter()
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = requests.post(url, headers={"Content-Type": "application/json"}, json=data, timeout=30)
         response.raise_for_status()  # Raise an exception for bad status codes
-    except requests.RequestException as exc:
+        payload = response.json()
+    except (requests.RequestException, ValueError) as exc:
+        _record_gemini_error(exc)
         print(f"Error calling Gemini API for address extraction: {exc}")
-        return "Unknown", "Unknown State"
+        return None
+    finally:
+        GEMINI_LATENCY.labels("sync").observe(time.perf_counter() - start)
+    return _parse_gemini_response(payload)
+
+
+def get_location_from_address(address: str, use_cache: bool = True) -> Location:
+    """
+    Extracts the city, state and approximate coordinates of an address using the Gemini API.
 
+    The address goes through the EXTRACTION_TIERS cascade (see
+    _extraction_cascade), so most addresses are answered by the cheapest model.
+
+    Args:
+        address: The full address string.
+        use_cache: Serve a previously extracted result for the same address
+            instead of calling Gemini again.
+
+    Returns:
+        A Location; UNKNOWN_LOCATION ("Unknown", "Unknown State", no
+        coordinates) if extraction fails.
+    """
+    if not address or not address.strip():
+        return UNKNOWN_LOCATION
+
+    if use_cache and (cached := _cached_location(address)) is not None:
+        return cached
+
+    cascade = _extraction_cascade(address)
     try:
+        tier = next(cascade)
+        while True:
+            tier = cascade.send(_call_gemini(address, tier))
+    except StopIteration as stop:
+        location = stop.value
+    _remember_location(address, location)
+    return location
+
+
+def get_city_and_state_from_address(address: str) -> Tuple[str, str]:
+    """
+    Extracts the city and state from a given address using the Gemini API.
+
+    Returns ("Unknown", "Unknown State") if extraction fails.
+    """
+    location = get_location_from_address(address)
+    return location.city, location.state
+
+
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Shared AsyncClient (connection pool) for the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(timeout=30)
+        _async_client_loop = loop
+    return _async_client
+
+
+async def aclose_async_client() -> None:
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
+
+
+async def _acall_gemini(address: str, tier: ExtractionTier) -> Optional[Extraction]:
+    request = _build_gemini_request(address, tier)
+    if request is None:
+        return None
+    url, data = request
+
+    start = time.perf_counter()
+    try:
+        response = await _get_async_client().post(url, json=data)
+        response.raise_for_status()
         payload = response.json()
-        content = payload.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "{}")
-        result = json.loads(content)
-        
-        city = result.get("city", "Unknown").strip()
-        state = result.get("state", "Unknown State").strip()
+    except (httpx.HTTPError, ValueError) as exc:
+        _record_gemini_error(exc)
+        print(f"Error calling Gemini API for address extraction: {exc}")
+        return None
+    finally:
+        GEMINI_LATENCY.labels("async").observe(time.perf_counter() - start)
+    return _parse_gemini_response(payload)
 
-        # Normalize the state name for consistency
-        normalized_state = _normalise_state_name(state)
 
-        return city or "Unknown", normalized_state or "Unknown State"
+async def aget_location_from_address(address: str, use_cache: bool = True) -> Location:
+    """
+    Async variant of get_location_from_address.
 
-    except (ValueError, IndexError, json.JSONDecodeError) as exc:
-        print(f"Gemini API returned an invalid response: {exc}")
-        return "Unknown", "Unknown State"
\ No newline at end of file
+    Waiting on Gemini does not hold a worker thread, so slow upstream calls
+    cannot exhaust the server's threadpool.
+    """
+    if not address or not address.strip():
+        return UNKNOWN_LOCATION
+
+    if use_cache and (cached := _cached_location(address)) is not None:
+        return cached
+
+    cascade = _extraction_cascade(address)
+    try:
+        tier = next(cascade)
+        while True:
+            tier = cascade.send(await _acall_gemini(address, tier))
+    except StopIteration as stop:
+        location = stop.value
+    _remember_location(address, location)
+    return location
+
+
+async def geocode_many(addresses: List[str], use_cache: bool = True) -> List[Location]:
+    """
+    Extract the Location of each address, at most GEOCODER_CONCURRENCY at a time.
+
+    Pass use_cache=False to ask Gemini again for every address (the fresh
+    results still replace the cached ones).
+    """
+    semaphore = asyncio.Semaphore(GEOCODER_CONCURRENCY)
+
+    async def geocode(address: str) -> Location:
+        async with semaphore:
+            return await aget_location_from_address(address, use_cache=use_cache)
+
+    return list(await asyncio.gather(*(geocode(address) for address in addresses)))
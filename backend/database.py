@@ -0,0 +1,124 @@
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic")
+
+# Arbitrary key for the PostgreSQL advisory lock that serialises migrations
+# when several workers start at the same time.
+MIGRATION_LOCK_KEY = 7_420_531
+
+
+def _sqlite_pragmas_from_env() -> Dict[str, str]:
+    """
+    PRAGMAs applied to every new SQLite connection.
+
+    WAL lets readers keep working while a long write (e.g. refresh-all-data) is
+    in progress, synchronous=NORMAL is durable under WAL without an fsync per
+    commit, and busy_timeout makes writers wait for the lock instead of failing
+    with "database is locked". Each value can be overridden through the
+    environment; an empty value skips that PRAGMA.
+    """
+    defaults = {
+        "journal_mode": ("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": ("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": ("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        "cache_size": ("SQLITE_CACHE_SIZE", "-65536"),  # negative = KiB, i.e. 64 MiB
+        "mmap_size": ("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+        "temp_store": ("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+    pragmas = {}
+    for pragma, (env_name, default) in defaults.items():
+        value = os.getenv(env_name, default).strip()
+        if value:
+            pragmas[pragma] = value
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, str]) -> None:
+    """Run the given PRAGMAs on every connection the engine opens."""
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in pragmas.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+
+def _pool_options_from_env() -> Dict[str, object]:
+    """Connection pool settings for server databases such as PostgreSQL."""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True,
+    }
+
+
+def create_app_engine(database_url: str, sqlite_pragmas: Optional[Dict[str, str]] = None) -> Engine:
+    """
+    Create the application's engine with the connection profile for its dialect.
+
+    SQLite gets the PRAGMA profile below; other databases get a sized, pre-pinged
+    connection pool. `sqlite_pragmas` overrides the environment-derived SQLite
+    profile; pass an empty dict to keep SQLite's defaults.
+    """
+    is_sqlite = database_url.startswith("sqlite")
+    engine = create_engine(database_url, **({} if is_sqlite else _pool_options_from_env()))
+    if is_sqlite:
+        if sqlite_pragmas is None:
+            sqlite_pragmas = _sqlite_pragmas_from_env()
+        if sqlite_pragmas:
+            apply_sqlite_pragmas(engine, sqlite_pragmas)
+    return engine
+
+
+# Async drivers used for each sync URL: aiosqlite for SQLite, psycopg 3 (which
+# is async-capable itself) for PostgreSQL.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+
+def create_async_app_engine(database_url: str, sqlite_pragmas: Optional[Dict[str, str]] = None) -> AsyncEngine:
+    """Async counterpart of create_app_engine for the same database."""
+    url = make_url(database_url)
+    url = url.set(drivername=_ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    is_sqlite = url.get_backend_name() == "sqlite"
+    engine = create_async_engine(url, **({} if is_sqlite else _pool_options_from_env()))
+    if is_sqlite:
+        if sqlite_pragmas is None:
+            sqlite_pragmas = _sqlite_pragmas_from_env()
+        if sqlite_pragmas:
+            apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas)
+    return engine
+
+
+def run_migrations(engine: Engine) -> None:
+    """Upgrade the database schema to the latest Alembic revision."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        elif connection.dialect.name == "sqlite":
+            # pysqlite would run the DDL outside any transaction; taking the
+            # write lock up front makes the whole upgrade one transaction, and
+            # other workers wait for it (busy_timeout) and then find the
+            # schema at head.
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
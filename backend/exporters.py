@@ -0,0 +1,138 @@
+"""
+File encoders for /api/export.
+
+Each encoder takes the selected columns of a statement and an async iterator
+of row batches from a streaming cursor, and returns an async iterator of byte
+chunks. Rows are never collected: CSV is written batch by batch, and XLSX and
+Parquet are written incrementally to a temporary file that is then streamed
+and removed. openpyxl and pyarrow are imported only when their format is used,
+so a missing package raises ImportError when the encoder is created.
+"""
+import asyncio
+import csv
+import io
+import os
+import tempfile
+from typing import AsyncIterator, Sequence
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+FILE_CHUNK_SIZE = 1024 * 1024
+XLSX_MAX_ROWS = 1_048_576  # per sheet, including the header row
+
+
+async def _iter_file(path: str) -> AsyncIterator[bytes]:
+    try:
+        with open(path, "rb") as file:
+            while chunk := await asyncio.to_thread(file.read, FILE_CHUNK_SIZE):
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def _temp_path(suffix: str) -> str:
+    fd, path = tempfile.mkstemp(prefix="export-", suffix=suffix)
+    os.close(fd)
+    return path
+
+
+def csv_export(columns, batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    async def chunks():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns.keys())
+        async for rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    return chunks()
+
+
+def _append_xlsx_rows(workbook, header, sheet, sheet_rows: int, rows: Sequence[tuple]):
+    """Append rows, starting a new sheet whenever one is full; returns the current sheet and its row count."""
+    for row in rows:
+        if sheet_rows == XLSX_MAX_ROWS:
+            sheet = workbook.create_sheet(f"centers_{len(workbook.worksheets) + 1}")
+            sheet.append(header)
+            sheet_rows = 1
+        sheet.append(tuple(row))
+        sheet_rows += 1
+    return sheet, sheet_rows
+
+
+def xlsx_export(columns, batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    from openpyxl import Workbook
+
+    async def chunks():
+        # Write-only workbooks spool each sheet to disk as rows are appended.
+        workbook = Workbook(write_only=True)
+        header = list(columns.keys())
+        sheet, sheet_rows = None, XLSX_MAX_ROWS
+        async for rows in batches:
+            # Appending runs openpyxl's per-cell Python code; keep it off the event loop.
+            sheet, sheet_rows = await asyncio.to_thread(_append_xlsx_rows, workbook, header, sheet, sheet_rows, rows)
+        if sheet is None:
+            workbook.create_sheet("centers_1").append(header)
+        path = _temp_path(".xlsx")
+        await asyncio.to_thread(workbook.save, path)
+        async for chunk in _iter_file(path):
+            yield chunk
+
+    return chunks()
+
+
+def arrow_schema(columns):
+    """Arrow schema for the selected SQLAlchemy columns."""
+    import pyarrow as pa
+
+    arrow_types = {bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string()}
+    return pa.schema([(key, arrow_types[column.type.python_type]) for key, column in columns.items()])
+
+
+def arrow_batch(schema, rows: Sequence[tuple]):
+    import pyarrow as pa
+
+    values = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(values, schema)], schema=schema
+    )
+
+
+def parquet_export(columns, batches: AsyncIterator[Sequence[tuple]]) -> AsyncIterator[bytes]:
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(columns)
+
+    async def chunks():
+        path = _temp_path(".parquet")
+        writer = pq.ParquetWriter(path, schema)
+        try:
+            async for rows in batches:
+                await asyncio.to_thread(writer.write_batch, arrow_batch(schema, rows))
+        finally:
+            writer.close()
+        async for chunk in _iter_file(path):
+            yield chunk
+
+    return chunks()
+
+
+async def write_arrow_file(columns, batches: AsyncIterator[Sequence[tuple]], path: str) -> None:
+    """Write the rows to `path` in the Arrow IPC file format, one record batch per row batch."""
+    import pyarrow as pa
+
+    schema = arrow_schema(columns)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        async for rows in batches:
+            await asyncio.to_thread(writer.write_batch, arrow_batch(schema, rows))
+
+
+ENCODERS = {"csv": csv_export, "xlsx": xlsx_export, "parquet": parquet_export}
@@ -0,0 +1,36 @@
+"""Geohash grid cells used to cluster centers on the map."""
+import math
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12
+
+
+def encode_geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base-32 geohash; a shared prefix means the points share a grid cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def geohash_precision_for_zoom(zoom: int) -> int:
+    """
+    Geohash length whose cells are roughly a quarter of a web-map tile wide.
+
+    A tile at zoom z spans 360 / 2**z degrees of longitude; a geohash of length
+    p spends ceil(5p / 2) bits on longitude, so p = ceil(2 * (z + 2) / 5).
+    """
+    return max(1, min(GEOHASH_PRECISION, math.ceil(2 * (zoom + 2) / 5)))
@@ -0,0 +1,211 @@
+"""
+Parsing and validation of uploaded center files.
+
+A batch upload (/api/upload/batch) is a list of CSV files and zip archives of
+CSV files (such as the CT_Scan_Results_<CITY>.csv files of the scraping
+pipeline). Archives are expanded into their CSV members, every file is parsed
+and validated on its own worker thread (pandas' C tokenizer releases the GIL),
+and the resulting rows are merged so each distinct address is geocoded only
+once.
+
+A chunked upload (/api/uploads) is parsed segment by segment while it
+arrives: complete_records_end() finds where the bytes received so far stop
+holding whole CSV records, and parse_segment() turns those records into rows.
+"""
+import asyncio
+import io
+import os
+import re
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+REQUIRED_COLUMNS = ("Center Name", "Address", "Contact Details", "Google Maps Link")
+OPTIONAL_COLUMNS = ("Notes",)
+
+# Upper bound on the uncompressed size of one upload, archives included.
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# What reading a damaged (bad CRC, truncated deflate stream), encrypted or
+# unsupported zip member raises.
+ARCHIVE_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError)
+
+_QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+_QUOTE, _NEWLINE = ord('"'), ord("\n")
+
+
+class UploadError(ValueError):
+    """An upload that cannot be processed at all (as opposed to one bad file in it)."""
+
+
+@dataclass
+class ParsedFile:
+    filename: str
+    rows: List[dict] = field(default_factory=list)
+    skipped_rows: int = 0
+    error: Optional[str] = None
+
+    def report(self, **extra) -> dict:
+        report = {"filename": self.filename, "rows": len(self.rows), "skipped_rows": self.skipped_rows}
+        if self.error:
+            report["error"] = self.error
+        return {**report, **extra}
+
+
+def address_key(address: str) -> str:
+    """Addresses that differ only in case or spacing are geocoded once."""
+    return " ".join(address.lower().split())
+
+
+def center_rows(df: pd.DataFrame) -> Tuple[List[dict], int]:
+    """CTScanCenter column values for the rows of a validated frame, and the number skipped for a blank address."""
+    rows = []
+    skipped = 0
+    for record in df.to_dict("records"):
+        address = (record.get("Address") or "").strip()
+        if not address:
+            skipped += 1
+            continue
+        rows.append({
+            "center_name": (record.get("Center Name") or "").strip(),
+            "address": address,
+            "contact_details": (record.get("Contact Details") or "").strip(),
+            "google_maps_link": (record.get("Google Maps Link") or "").strip(),
+            "notes": (record.get("Notes") or "").strip(),
+        })
+    return rows, skipped
+
+
+def missing_columns(columns) -> List[str]:
+    return [column for column in REQUIRED_COLUMNS if column not in columns]
+
+
+def parse_csv(filename: str, data: bytes) -> ParsedFile:
+    parsed = ParsedFile(filename)
+    try:
+        df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding="utf-8")
+    except UnicodeDecodeError:
+        parsed.error = "File is not UTF-8 encoded"
+        return parsed
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as exc:
+        parsed.error = f"Could not parse CSV: {exc}"
+        return parsed
+    missing = missing_columns(df.columns)
+    if missing:
+        parsed.error = f"Missing columns: {', '.join(missing)}"
+        return parsed
+    parsed.rows, parsed.skipped_rows = center_rows(df)
+    return parsed
+
+
+def expand_upload(filename: str, data: bytes) -> List[Tuple[str, bytes]]:
+    """(filename, contents) of each CSV in an uploaded file; zip archives yield their CSV members."""
+    if not zipfile.is_zipfile(io.BytesIO(data)):
+        return [(filename, data)]
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".csv")
+            and not os.path.basename(info.filename).startswith(".")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        if sum(info.file_size for info in members) > UPLOAD_MAX_BYTES:
+            raise UploadError(f"Archive '{filename}' expands beyond {UPLOAD_MAX_BYTES} bytes")
+        return [(os.path.basename(info.filename), archive.read(info)) for info in members]
+
+
+async def parse_uploads(files: List[Tuple[str, bytes]]) -> List[ParsedFile]:
+    """Expand archives, then parse every CSV concurrently in the default thread pool."""
+    expanded: List[Tuple[str, Optional[bytes]]] = []
+    unreadable: Dict[str, str] = {}
+    total = 0
+    for filename, data in files:
+        try:
+            members = await asyncio.to_thread(expand_upload, filename, data)
+        except ARCHIVE_ERRORS as exc:
+            # A damaged or encrypted archive is reported like any other invalid file.
+            unreadable[filename] = f"Could not read archive: {exc}"
+            expanded.append((filename, None))
+            continue
+        for member in members:
+            total += len(member[1])
+            if total > UPLOAD_MAX_BYTES:
+                raise UploadError(f"Upload expands beyond {UPLOAD_MAX_BYTES} bytes")
+            expanded.append(member)
+
+    names: Dict[str, int] = {}
+    for filename, _ in expanded:
+        names[filename] = names.get(filename, 0) + 1
+
+    async def parse(filename: str, data: Optional[bytes]) -> ParsedFile:
+        if data is None:
+            return ParsedFile(filename, error=unreadable[filename])
+        return await asyncio.to_thread(parse_csv, filename, data)
+
+    parsed = await asyncio.gather(*(parse(filename, data) for filename, data in expanded))
+    for result in parsed:
+        if names[result.filename] > 1:
+            result.error, result.rows = "The same filename appears more than once in this upload", []
+    return list(parsed)
+
+
+def complete_records_end(data: bytes) -> int:
+    """
+    Length of the prefix of `data` that holds only complete CSV records.
+
+    `data` must start at a record boundary. A newline ends a record unless it
+    is inside a quoted field. As in pandas' tokenizer, a quote opens a quoted
+    field only at the start of a field; elsewhere (`Opp. 5" Pipe Lane`) it is
+    an ordinary character. Inside a quoted field `""` is an escaped quote.
+    """
+    end = 0
+    position = 0
+    while (match := _QUOTE_OR_NEWLINE.search(data, position)) is not None:
+        index = match.start()
+        position = index + 1
+        if data[index] == _NEWLINE:
+            end = position
+            continue
+        if index > 0 and data[index - 1] not in b",\n":
+            continue
+        # Skip to the quote closing this field.
+        while True:
+            close = data.find(b'"', position)
+            if close == -1 or close + 1 == len(data):
+                return end
+            if data[close + 1] != _QUOTE:
+                break
+            position = close + 2
+        position = close + 1
+    return end
+
+
+def parse_segment(data: bytes, columns: Optional[Sequence[str]]) -> Tuple[Optional[List[str]], List[dict], int]:
+    """
+    Rows of a run of complete CSV records, given the header read from an earlier segment.
+
+    The first segment of a file (`columns` None) starts with the header, which
+    is validated and returned for the following segments.
+    """
+    if not data.strip():
+        return columns, [], 0
+    try:
+        if columns is None:
+            df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding="utf-8-sig")
+            missing = missing_columns(df.columns)
+            if missing:
+                raise UploadError(f"Missing columns: {', '.join(missing)}")
+        else:
+            df = pd.read_csv(
+                io.BytesIO(data), header=None, names=list(columns), dtype=str, keep_default_na=False, encoding="utf-8"
+            )
+    except UnicodeDecodeError:
+        raise UploadError("File is not UTF-8 encoded")
+    except pd.errors.ParserError as exc:
+        raise UploadError(f"Could not parse CSV: {exc}")
+    rows, skipped = center_rows(df)
+    return list(df.columns), rows, skipped
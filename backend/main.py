@@ -1,15 +1,54 @@
+import asyncio
+import glob
+import json
+import logging
 import os
+import tempfile
+import time
+import uuid
+import orjson
 import pandas as pd
-from fastapi import FastAPI, File, UploadFile, Depends, Query, HTTPException
+from fastapi import FastAPI, File, UploadFile, Depends, Query, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Text, text
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from sqlalchemy import case, event, insert, or_, select, func, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.ext.declarative import declarative_base
 from pydantic import BaseModel
 from typing import List
 from io import StringIO
 
-from city_utils import get_city_and_state_from_address
+from city_utils import (
+    Location,
+    aclose_async_client,
+    aget_location_from_address,
+    coordinates_from_maps_link,
+    geocode_many,
+    get_location_from_address,
+)
+from database import create_app_engine, create_async_app_engine, run_migrations
+from ingest import UPLOAD_MAX_BYTES, UploadError, address_key, complete_records_end, parse_segment, parse_uploads
+from exporters import ENCODERS as EXPORT_ENCODERS, MEDIA_TYPES as EXPORT_MEDIA_TYPES, write_arrow_file
+from models import UploadedFile, CTScanCenter, CacheGeneration, ChunkedUpload, center_geohash
+from metrics import (
+    DUPLICATE_JOB_CENTERS,
+    DUPLICATE_JOB_DURATION,
+    DUPLICATES_FOUND,
+    UPLOAD_DURATION,
+    UPLOAD_ROWS,
+    MetricsMiddleware,
+    metrics_response_body,
+)
+from request_stats import instrument_engine, timed
+from normalization import RULES_QUERY, RuleSet, active_rules, load_rules, set_active_rules
+from profiler import ProfilerMiddleware
+from read_cache import ResponseCache
+from geo_grid import geohash_precision_for_zoom
+from spatial import bounding_box, haversine_km, within_bbox
+
+log = logging.getLogger(__name__)
 
 
 def _load_env_from_file() -> None:
@@ -32,52 +71,85 @@ def _load_env_from_file() -> None:
 _load_env_from_file()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ct_scan_centers.db")
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-class UploadedFile(Base):
-    __tablename__ = "uploaded_files"
-    id = Column(Integer, primary_key=True, index=True)
-    filename = Column(String, unique=True, index=True)
-
-
-class CTScanCenter(Base):
-    __tablename__ = "ct_scan_centers"
-    id = Column(Integer, primary_key=True, index=True)
-    center_name = Column(String, index=True)
-    address = Column(String)
-    contact_details = Column(String)
-    google_maps_link = Column(String)
-    city = Column(String, index=True)
-    validated = Column(Boolean, default=False)
-    qualified = Column(Boolean, default=False)
-    existing_client = Column(Boolean, default=False)
-    not_to_pursue = Column(Boolean, default=False)
-    notes = Column(Text, default="")
-    stored_state = Column(String, default=None)
-
-    @property
-    def state(self) -> str:
-        return self.stored_state or "Unknown State"
-
-Base.metadata.create_all(bind=engine)
-
-def ensure_database_columns():
-    with engine.connect() as conn:
-        result = conn.execute(text("PRAGMA table_info(ct_scan_centers)"))
-        columns = {row[1] for row in result}
-        if "notes" not in columns:
-            conn.execute(text("ALTER TABLE ct_scan_centers ADD COLUMN notes TEXT DEFAULT ''"))
-        if "stored_state" not in columns:
-            conn.execute(text("ALTER TABLE ct_scan_centers ADD COLUMN stored_state TEXT DEFAULT NULL"))
-        if "existing_client" not in columns:
-            conn.execute(text("ALTER TABLE ct_scan_centers ADD COLUMN existing_client BOOLEAN DEFAULT FALSE"))
-        if "not_to_pursue" not in columns:
-            conn.execute(text("ALTER TABLE ct_scan_centers ADD COLUMN not_to_pursue BOOLEAN DEFAULT FALSE"))
-        conn.commit()
-
-ensure_database_columns()
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "1000"))
+READ_CACHE_MAX_BYTES = int(os.getenv("READ_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots"))
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads"))
+# Suggested chunk size for /api/uploads; below nginx's default 1 MiB body limit.
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(512 * 1024)))
+# Most bytes of a chunked upload parsed, geocoded and inserted at a time.
+UPLOAD_SEGMENT_BYTES = int(os.getenv("UPLOAD_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+engine = create_app_engine(DATABASE_URL)
+async_engine = create_async_app_engine(DATABASE_URL)
+
+
+class AppSession(Session):
+    """Session class shared by the sync and async session factories, so both get the events below."""
+
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AppSession)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False, sync_session_class=AppSession
+)
+run_migrations(engine)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+_GENERATION_BUMPED = "cache_generation_bumped"
+CACHE_GENERATION_ROW = 1
+
+def bump_cache_generation(session: Session) -> None:
+    """Bump the shared generation once per transaction, inside that transaction."""
+    if session.info.get(_GENERATION_BUMPED):
+        return
+    session.connection().execute(
+        update(CacheGeneration)
+        .where(CacheGeneration.id == CACHE_GENERATION_ROW)
+        .values(generation=CacheGeneration.generation + 1)
+    )
+    session.info[_GENERATION_BUMPED] = True
+
+@event.listens_for(AppSession, "after_flush")
+def _bump_generation_after_flush(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        bump_cache_generation(session)
+
+@event.listens_for(AppSession, "do_orm_execute")
+def _bump_generation_on_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        bump_cache_generation(orm_execute_state.session)
+
+@event.listens_for(AppSession, "after_commit")
+@event.listens_for(AppSession, "after_rollback")
+def _reset_generation_flag(session):
+    session.info.pop(_GENERATION_BUMPED, None)
+
+response_cache = ResponseCache(max_bytes=READ_CACHE_MAX_BYTES)
+
+async def current_generation(db: AsyncSession) -> int:
+    return (
+        await db.execute(select(CacheGeneration.generation).where(CacheGeneration.id == CACHE_GENERATION_ROW))
+    ).scalar()
+
+with engine.connect() as _conn:
+    set_active_rules(load_rules(_conn, _conn.execute(
+        select(CacheGeneration.generation).where(CacheGeneration.id == CACHE_GENERATION_ROW)
+    ).scalar()))
+
+async def refresh_normalization_rules(db: AsyncSession) -> None:
+    """Recompile the normalization rules if the database changed since they were loaded."""
+    generation = await current_generation(db)
+    if generation != active_rules().generation:
+        set_active_rules(RuleSet((await db.execute(RULES_QUERY)).all(), generation))
+
+async def cached_json_response(db: AsyncSession, key, build) -> Response:
+    """Serve the body encoded by `await build()` from the response cache while no write has happened."""
+    generation = await current_generation(db)
+    body = response_cache.get(key, generation)
+    if body is None:
+        body = await build()
+        response_cache.put(key, generation, body)
+    return Response(body, media_type="application/json")
 
 class CTScanCenterSchema(BaseModel):
     id: int
@@ -92,10 +164,131 @@ class CTScanCenterSchema(BaseModel):
     existing_client: bool
     not_to_pursue: bool
     notes: str | None
+    version: int
+    latitude: float | None = None
+    longitude: float | None = None
 
     class Config:
         from_attributes = True
 
+# Column expressions matching CTScanCenterSchema, used by the list endpoints to
+# select plain row tuples instead of hydrating ORM objects.
+CENTER_COLUMNS = {
+    "id": CTScanCenter.id,
+    "center_name": CTScanCenter.center_name,
+    "address": CTScanCenter.address,
+    "contact_details": CTScanCenter.contact_details,
+    "google_maps_link": CTScanCenter.google_maps_link,
+    "city": CTScanCenter.city,
+    "state": func.coalesce(func.nullif(CTScanCenter.stored_state, ""), "Unknown State").label("state"),
+    "validated": CTScanCenter.validated,
+    "qualified": CTScanCenter.qualified,
+    "existing_client": CTScanCenter.existing_client,
+    "not_to_pursue": CTScanCenter.not_to_pursue,
+    "notes": CTScanCenter.notes,
+    "version": CTScanCenter.version,
+    "latitude": CTScanCenter.latitude,
+    "longitude": CTScanCenter.longitude,
+}
+
+FIELDS_DESCRIPTION = "Comma-separated columns to return, e.g. id,center_name,city,state,validated"
+
+def parse_fields(fields: str | None) -> List[str] | None:
+    """Parse a `?fields=id,center_name,...` projection into column names."""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in CENTER_COLUMNS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed fields: {', '.join(CENTER_COLUMNS)}",
+        )
+    return names or None
+
+def location_columns(location: Location, google_maps_link: str | None = None) -> dict:
+    """
+    Column values for a geocoded location, with the normalization rules applied.
+
+    Coordinates in the Maps link win over Gemini's estimate.
+    """
+    latitude, longitude = coordinates_from_maps_link(google_maps_link)
+    if latitude is None:
+        latitude, longitude = location.latitude, location.longitude
+    city, state = active_rules().normalize(location.city, location.state)
+    return {
+        "city": city,
+        "stored_state": state,
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": center_geohash(latitude, longitude),
+    }
+
+def state_condition(state: str):
+    """Filter matching the centers the API reports under `state`, including the "Unknown State" group."""
+    if state == "Unknown State":
+        return or_(CTScanCenter.stored_state.is_(None), CTScanCenter.stored_state.in_(("", "Unknown State")))
+    return CTScanCenter.stored_state == state
+
+def select_centers(fields: List[str] | None = None):
+    if fields is None:
+        return select(*CENTER_COLUMNS.values())
+    return select(*(CENTER_COLUMNS[name] for name in fields))
+
+def encode_rows(result) -> bytes:
+    """Encode a Core result directly with orjson.
+
+    The rows already have the shape of CTScanCenterSchema, so per-row Pydantic
+    validation is skipped; the declared response_model only documents the API.
+    """
+    keys = list(result.keys())
+    with timed("serialization"):
+        return orjson.dumps([dict(zip(keys, row)) for row in result])
+
+async def rows_body(db: AsyncSession, statement) -> bytes:
+    return encode_rows(await db.execute(statement))
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def iter_rows(statement):
+    """Yield the statement's rows in batches of STREAM_BATCH_SIZE from a server-side cursor."""
+    # The request-scoped session is closed before a streamed body is sent, so
+    # the stream owns its connection for as long as the client is reading.
+    async with async_engine.connect() as conn:
+        result = await conn.stream(statement)
+        async for batch in result.partitions(STREAM_BATCH_SIZE):
+            yield batch
+
+async def _iter_row_batches(statement):
+    keys = list(statement.selected_columns.keys())
+    async for batch in iter_rows(statement):
+        yield [orjson.dumps(dict(zip(keys, row))) for row in batch]
+
+async def iter_ndjson(statement):
+    async for encoded in _iter_row_batches(statement):
+        yield b"\n".join(encoded) + b"\n"
+
+async def iter_json_array(statement):
+    yield b"["
+    separator = b""
+    async for encoded in _iter_row_batches(statement):
+        yield separator + b",".join(encoded)
+        separator = b","
+    yield b"]"
+
+async def list_response(request: Request, db: AsyncSession, statement, stream: bool):
+    """Return rows as one JSON document, or stream them batch by batch.
+
+    Streaming is selected with `Accept: application/x-ndjson` (one object per
+    line) or `?stream=1` (the same JSON array as the buffered response).
+    """
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(iter_ndjson(statement), media_type=NDJSON_MEDIA_TYPE)
+    if stream:
+        return StreamingResponse(iter_json_array(statement), media_type="application/json")
+    key = (request.url.path, request.url.query)
+    return await cached_json_response(db, key, lambda: rows_body(db, statement))
+
 class CTScanCenterUpdateSchema(BaseModel):
     center_name: str
     address: str
@@ -108,12 +301,45 @@ class CTScanCenterUpdateSchema(BaseModel):
     not_to_pursue: bool
     notes: str | None = ""
 
+class CTScanCenterPatchSchema(BaseModel):
+    """JSON merge-patch body: only the keys present in the request are written."""
+    center_name: str | None = None
+    address: str | None = None
+    contact_details: str | None = None
+    google_maps_link: str | None = None
+    city: str | None = None
+    state: str | None = None
+    validated: bool | None = None
+    qualified: bool | None = None
+    existing_client: bool | None = None
+    not_to_pursue: bool | None = None
+    notes: str | None = None
+
+    class Config:
+        extra = "forbid"
+
+class NotesUpdateSchema(BaseModel):
+    notes: str | None = ""
+
 class StatusUpdateSchema(BaseModel):
     validated: bool
     qualified: bool
     existing_client: bool
     not_to_pursue: bool
 
+class BulkStatusUpdateSchema(BaseModel):
+    """Flags to set on every center matched by `ids` and/or the city/state filter."""
+    ids: List[int] | None = None
+    city: str | None = None
+    state: str | None = None
+    validated: bool | None = None
+    qualified: bool | None = None
+    existing_client: bool | None = None
+    not_to_pursue: bool | None = None
+
+class BulkDeleteSchema(BaseModel):
+    ids: List[int]
+
 app = FastAPI()
 
 app.add_middleware(
@@ -123,6 +349,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(MetricsMiddleware, router_app=app)
+app.add_middleware(ProfilerMiddleware)
 
 def get_db():
     db = SessionLocal()
@@ -131,6 +360,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 @app.on_event("startup")
 def load_initial_data():
     db = SessionLocal()
@@ -139,37 +372,156 @@ def load_initial_data():
         for file_name in data_files:
             df = pd.read_csv(os.path.join("..", file_name))
             for _, row in df.iterrows():
-                city, state = get_city_and_state_from_address(row["Address"])
+                location = get_location_from_address(row["Address"])
                 center = CTScanCenter(
                     center_name=row["Center Name"],
                     address=row["Address"],
                     contact_details=row["Contact Details"],
                     google_maps_link=row["Google Maps Link"],
-                    city=city,
-                    stored_state=state,
-                    notes=str(row.get("Notes", "") or "")
+                    notes=str(row.get("Notes", "") or ""),
+                    **location_columns(location, row["Google Maps Link"]),
                 )
                 db.add(center)
+            UPLOAD_ROWS.labels("initial_load").inc(len(df))
         db.commit()
     db.close()
 
+@app.on_event("shutdown")
+async def close_connections():
+    await aclose_async_client()
+    await async_engine.dispose()
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    body, content_type = metrics_response_body()
+    return Response(body, media_type=content_type)
+
 @app.get("/api/centers", response_model=List[CTScanCenterSchema])
-def get_centers(db: Session = Depends(get_db)):
-    return db.query(CTScanCenter).all()
+async def get_centers(
+    request: Request,
+    stream: bool = False,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await list_response(request, db, select_centers(parse_fields(fields)), stream)
+
+def _parse_bbox(bbox: str) -> tuple:
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be min_lng,min_lat,max_lng,max_lat")
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="bbox minimums must not exceed maximums")
+    return min_lat, min_lng, max_lat, max_lng
+
+@app.get("/api/centers/nearby")
+async def get_nearby_centers(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10, gt=0, le=1000),
+    limit: int = Query(200, ge=1, le=5000),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Centers within `radius_km` of (lat, lng), nearest first, with `distance_km`."""
+    names = parse_fields(fields) or list(CENTER_COLUMNS)
+    names += [name for name in ("latitude", "longitude") if name not in names]
+    statement = select_centers(names).where(within_bbox(async_engine.dialect.name, *bounding_box(lat, lng, radius_km)))
+
+    nearby = []
+    for row in (await db.execute(statement)).mappings():
+        distance = haversine_km(lat, lng, row["latitude"], row["longitude"])
+        if distance <= radius_km:
+            nearby.append({**row, "distance_km": round(distance, 3)})
+    nearby.sort(key=lambda center: center["distance_km"])
+    return ORJSONResponse(nearby[:limit])
+
+@app.get("/api/centers/in-bbox", response_model=List[CTScanCenterSchema])
+async def get_centers_in_bbox(
+    request: Request,
+    bbox: str = Query(..., description="min_lng,min_lat,max_lng,max_lat"),
+    stream: bool = False,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+):
+    statement = select_centers(parse_fields(fields)).where(within_bbox(async_engine.dialect.name, *_parse_bbox(bbox)))
+    return await list_response(request, db, statement, stream)
+
+CLUSTER_STATUS_FLAGS = ("validated", "qualified", "existing_client", "not_to_pursue")
+
+# Every cluster of the map at one geohash precision, keyed by precision and
+# rebuilt when the cache generation moves. Zoom levels that share a precision
+# share an entry, and panning only filters the cached list.
+_cluster_cache: dict = {}
+
+async def map_clusters(db: AsyncSession, precision: int) -> list:
+    generation = await current_generation(db)
+    cached = _cluster_cache.get(precision)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    cell = func.substr(CTScanCenter.geohash, 1, precision).label("geohash")
+    statement = (
+        select(
+            cell,
+            func.count().label("count"),
+            func.avg(CTScanCenter.latitude).label("latitude"),
+            func.avg(CTScanCenter.longitude).label("longitude"),
+            func.min(CTScanCenter.id).label("center_id"),
+            *(
+                func.sum(case((getattr(CTScanCenter, flag), 1), else_=0)).label(flag)
+                for flag in CLUSTER_STATUS_FLAGS
+            ),
+        )
+        .where(CTScanCenter.geohash.is_not(None))
+        .group_by(cell)
+    )
+    clusters = []
+    for row in (await db.execute(statement)).mappings():
+        cluster = dict(row)
+        if cluster["count"] > 1:
+            cluster["center_id"] = None
+        clusters.append(cluster)
+    _cluster_cache[precision] = (generation, clusters)
+    return clusters
+
+@app.get("/api/map/clusters")
+async def get_map_clusters(
+    zoom: int = Query(..., ge=0, le=22),
+    bbox: str | None = Query(None, description="min_lng,min_lat,max_lng,max_lat"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Centers aggregated into grid cells about a quarter of a map tile wide.
+
+    Each cluster has its centroid, the number of centers and how many of them
+    carry each status flag; single-center clusters also give `center_id`.
+    """
+    precision = geohash_precision_for_zoom(zoom)
+    clusters = await map_clusters(db, precision)
+    if bbox:
+        min_lat, min_lng, max_lat, max_lng = _parse_bbox(bbox)
+        clusters = [
+            cluster for cluster in clusters
+            if min_lat <= cluster["latitude"] <= max_lat and min_lng <= cluster["longitude"] <= max_lng
+        ]
+    return ORJSONResponse({"zoom": zoom, "precision": precision, "clusters": clusters})
 
 @app.put("/api/centers/{center_id}", response_model=CTScanCenterSchema)
-def update_center(center_id: int, center_data: CTScanCenterUpdateSchema, db: Session = Depends(get_db)):
-    center = db.query(CTScanCenter).filter(CTScanCenter.id == center_id).first()
+async def update_center(center_id: int, center_data: CTScanCenterUpdateSchema, db: AsyncSession = Depends(get_async_db)):
+    center = await db.get(CTScanCenter, center_id)
     if not center:
         raise HTTPException(status_code=404, detail="Center not found")
+    await refresh_normalization_rules(db)
     
-    # When the address is updated, re-fetch city and state
+    # When the address is updated, re-fetch city, state and coordinates
     if center.address != center_data.address.strip():
-        new_city, new_state = get_city_and_state_from_address(center_data.address)
-        center.city = new_city
-        center.stored_state = new_state
+        with timed("geocoder"):
+            location = await aget_location_from_address(center_data.address)
+        for column, value in location_columns(location, center_data.google_maps_link).items():
+            setattr(center, column, value)
     else:
-        center.city = center_data.city.strip()
+        center.city = active_rules().normalize_columns({"city": center_data.city.strip()})["city"]
 
     center.center_name = center_data.center_name.strip()
     center.address = center_data.address.strip()
@@ -181,13 +533,93 @@ def update_center(center_id: int, center_data: CTScanCenterUpdateSchema, db: Ses
     center.not_to_pursue = center_data.not_to_pursue
     center.notes = (center_data.notes or "").strip()
     
-    db.commit()
-    db.refresh(center)
+    await db.commit()
+    await db.refresh(center)
     return center
 
+def _parse_if_match(if_match: str | None) -> int | None:
+    """Return the version an If-Match header requires, or None for no precondition."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be a center version ETag")
+    return int(tag)
+
+async def patch_center_columns(db: AsyncSession, center_id: int, changes: dict, if_match: str | None) -> ORJSONResponse:
+    """Write only the supplied columns with one UPDATE ... RETURNING."""
+    expected_version = _parse_if_match(if_match)
+    changes = {key: value.strip() if isinstance(value, str) else value for key, value in changes.items()}
+    if "state" in changes:
+        changes["stored_state"] = changes.pop("state")
+    if changes.keys() & {"address", "city", "stored_state"}:
+        await refresh_normalization_rules(db)
+        active_rules().normalize_columns(changes)
+
+    if changes.get("address") is not None:
+        current_address = (await db.execute(select(CTScanCenter.address).where(CTScanCenter.id == center_id))).scalar()
+        if current_address is not None and current_address != changes["address"]:
+            with timed("geocoder"):
+                location = await aget_location_from_address(changes["address"])
+            for column, value in location_columns(location, changes.get("google_maps_link")).items():
+                changes.setdefault(column, value)
+
+    conditions = [CTScanCenter.id == center_id]
+    if expected_version is not None:
+        conditions.append(CTScanCenter.version == expected_version)
+    if changes:
+        statement = (
+            update(CTScanCenter)
+            .where(*conditions)
+            .values(**changes, version=CTScanCenter.version + 1)
+            .returning(*CENTER_COLUMNS.values())
+        )
+    else:
+        statement = select_centers().where(*conditions)
+
+    row = (await db.execute(statement, execution_options={"synchronize_session": False})).first()
+    if row is None:
+        await db.rollback()
+        if (await db.execute(select(CTScanCenter.id).where(CTScanCenter.id == center_id))).first() is None:
+            raise HTTPException(status_code=404, detail="Center not found")
+        raise HTTPException(status_code=412, detail="Center was modified by another request")
+    await db.commit()
+    return ORJSONResponse(dict(row._mapping), headers={"ETag": f'"{row.version}"'})
+
+@app.get("/api/centers/{center_id}", response_model=CTScanCenterSchema)
+async def get_center(center_id: int, db: AsyncSession = Depends(get_async_db)):
+    """One center, with its version as the ETag to send back in If-Match."""
+    row = (await db.execute(select_centers().where(CTScanCenter.id == center_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Center not found")
+    return ORJSONResponse(dict(row._mapping), headers={"ETag": f'"{row.version}"'})
+
+@app.patch("/api/centers/{center_id}", response_model=CTScanCenterSchema)
+async def patch_center(
+    center_id: int,
+    center_patch: CTScanCenterPatchSchema,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    changes = center_patch.model_dump(exclude_unset=True)
+    # A merge-patch null clears a value; a cleared status flag is False, its column default.
+    for flag in ("validated", "qualified", "existing_client", "not_to_pursue"):
+        if flag in changes and changes[flag] is None:
+            changes[flag] = False
+    return await patch_center_columns(db, center_id, changes, if_match)
+
+@app.patch("/api/centers/{center_id}/notes", response_model=CTScanCenterSchema)
+async def update_notes(
+    center_id: int,
+    notes_data: NotesUpdateSchema,
+    if_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await patch_center_columns(db, center_id, {"notes": notes_data.notes or ""}, if_match)
+
 @app.put("/api/centers/{center_id}/status", response_model=CTScanCenterSchema)
-def update_status(center_id: int, status_data: StatusUpdateSchema, db: Session = Depends(get_db)):
-    center = db.query(CTScanCenter).filter(CTScanCenter.id == center_id).first()
+async def update_status(center_id: int, status_data: StatusUpdateSchema, db: AsyncSession = Depends(get_async_db)):
+    center = await db.get(CTScanCenter, center_id)
     if not center:
         raise HTTPException(status_code=404, detail="Center not found")
 
@@ -196,29 +628,69 @@ def update_status(center_id: int, status_data: StatusUpdateSchema, db: Session =
     center.existing_client = status_data.existing_client
     center.not_to_pursue = status_data.not_to_pursue
     
-    db.commit()
-    db.refresh(center)
+    await db.commit()
+    await db.refresh(center)
     return center
 
+async def bulk_update_flags(db: AsyncSession, conditions: list, flags: dict) -> int:
+    """Set `flags` on all matching centers with one UPDATE statement and commit."""
+    result = await db.execute(
+        update(CTScanCenter).where(*conditions).values(**flags, version=CTScanCenter.version + 1),
+        execution_options={"synchronize_session": False},
+    )
+    await db.commit()
+    return result.rowcount
+
+@app.post("/api/centers/bulk-status")
+async def bulk_update_status(status_data: BulkStatusUpdateSchema, db: AsyncSession = Depends(get_async_db)):
+    flags = status_data.model_dump(
+        include={"validated", "qualified", "existing_client", "not_to_pursue"}, exclude_none=True
+    )
+    if not flags:
+        raise HTTPException(status_code=400, detail="No status flags supplied")
+
+    conditions = []
+    if status_data.ids is not None:
+        conditions.append(CTScanCenter.id.in_(status_data.ids))
+    if status_data.city is not None:
+        conditions.append(CTScanCenter.city == status_data.city)
+    if status_data.state is not None:
+        conditions.append(state_condition(status_data.state))
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Specify ids, city or state to select centers")
+
+    return {"updated_count": await bulk_update_flags(db, conditions, flags)}
+
+@app.put("/api/cities/{city_name}/validate")
+async def validate_city(
+    city_name: str, validated: bool = True, state: str | None = None, db: AsyncSession = Depends(get_async_db)
+):
+    conditions = [CTScanCenter.city == city_name]
+    if state is not None:
+        conditions.append(state_condition(state))
+    return {"updated_count": await bulk_update_flags(db, conditions, {"validated": validated})}
+
 @app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_file(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
+    start = time.perf_counter()
     # Check if the file has been uploaded before
-    existing_file = db.query(UploadedFile).filter(UploadedFile.filename == file.filename).first()
+    existing_file = (await db.execute(select(UploadedFile.id).where(UploadedFile.filename == file.filename))).first()
     if existing_file:
         raise HTTPException(status_code=409, detail=f"File '{file.filename}' has already been uploaded.")
 
     contents = await file.read()
     df = pd.read_csv(StringIO(contents.decode('utf-8')))
-    for _, row in df.iterrows():
-        city, state = get_city_and_state_from_address(row["Address"])
+    await refresh_normalization_rules(db)
+    with timed("geocoder"):
+        locations = await geocode_many(df["Address"].tolist())
+    for (_, row), location in zip(df.iterrows(), locations):
         center = CTScanCenter(
             center_name=row["Center Name"],
             address=row["Address"],
             contact_details=row["Contact Details"],
             google_maps_link=row["Google Maps Link"],
-            city=city,
-            stored_state=state,
-            notes=str(row.get("Notes", "") or "")
+            notes=str(row.get("Notes", "") or ""),
+            **location_columns(location, row["Google Maps Link"]),
         )
         db.add(center)
     
@@ -226,20 +698,376 @@ async def upload_file(file: UploadFile = File(...), db: Session = Depends(get_db
     new_uploaded_file = UploadedFile(filename=file.filename)
     db.add(new_uploaded_file)
     
-    db.commit()
+    await db.commit()
+    UPLOAD_ROWS.labels("upload").inc(len(df))
+    UPLOAD_DURATION.observe(time.perf_counter() - start)
     return {"message": "File uploaded and data added successfully"}
 
+async def geocode_rows(rows: List[dict]) -> int:
+    """
+    Add the location columns to center rows, geocoding each distinct address once.
+
+    Returns the number of distinct addresses looked up.
+    """
+    addresses = {}
+    for row in rows:
+        addresses.setdefault(address_key(row["address"]), row["address"])
+    with timed("geocoder"):
+        locations = dict(zip(addresses, await geocode_many(list(addresses.values()))))
+    for row in rows:
+        row.update(location_columns(locations[address_key(row["address"])], row["google_maps_link"]))
+    return len(addresses)
+
+async def read_uploads(files: List[UploadFile], chunk_size: int = 1024 * 1024) -> List[tuple]:
+    """(filename, contents) of each uploaded file, refusing to read more than UPLOAD_MAX_BYTES in total."""
+    if sum(file.size or 0 for file in files) > UPLOAD_MAX_BYTES:
+        raise UploadError(f"Upload is larger than {UPLOAD_MAX_BYTES} bytes")
+    contents = []
+    total = 0
+    for file in files:
+        chunks = []
+        while chunk := await file.read(chunk_size):
+            total += len(chunk)
+            if total > UPLOAD_MAX_BYTES:
+                raise UploadError(f"Upload is larger than {UPLOAD_MAX_BYTES} bytes")
+            chunks.append(chunk)
+        contents.append((file.filename, b"".join(chunks)))
+    return contents
+
+@app.post("/api/upload/batch")
+async def upload_files(files: List[UploadFile] = File(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Upload several CSV files and/or zip archives of CSV files at once.
+
+    Files are parsed in parallel and addresses shared between files are
+    geocoded once. Every valid file is inserted in a single transaction;
+    files that fail validation or were uploaded before are skipped and listed
+    with their error in the per-file report.
+    """
+    start = time.perf_counter()
+    try:
+        parsed = await parse_uploads(await read_uploads(files))
+    except UploadError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="The upload contains no CSV files")
+
+    already_uploaded = set((await db.execute(
+        select(UploadedFile.filename).where(UploadedFile.filename.in_([result.filename for result in parsed]))
+    )).scalars())
+    being_uploaded = set((await db.execute(
+        select(ChunkedUpload.filename).where(
+            ChunkedUpload.filename.in_([result.filename for result in parsed]), ChunkedUpload.status != UPLOAD_COMPLETE
+        )
+    )).scalars())
+    for result in parsed:
+        if result.filename in already_uploaded:
+            result.error, result.rows = f"File '{result.filename}' has already been uploaded.", []
+        elif result.filename in being_uploaded:
+            result.error, result.rows = f"File '{result.filename}' is being uploaded in chunks.", []
+    accepted = [result for result in parsed if result.error is None]
+    if not accepted:
+        raise HTTPException(status_code=400, detail={"files": [result.report() for result in parsed]})
+
+    rows = [row for result in accepted for row in result.rows]
+    await refresh_normalization_rules(db)
+    distinct_addresses = await geocode_rows(rows)
+    if rows:
+        await db.execute(insert(CTScanCenter), rows)
+    await db.execute(insert(UploadedFile), [{"filename": result.filename} for result in accepted])
+    await db.commit()
+
+    UPLOAD_ROWS.labels("batch_upload").inc(len(rows))
+    UPLOAD_DURATION.observe(time.perf_counter() - start)
+    return {
+        "message": f"Added {len(rows)} centers from {len(accepted)} of {len(parsed)} files.",
+        "inserted_count": len(rows),
+        "distinct_addresses": distinct_addresses,
+        "files": [result.report() for result in parsed],
+    }
+
+# Resumable uploads: POST /api/uploads starts one, PUT /api/uploads/{id}?offset=
+# appends a chunk (the body), GET reports the offset to resume from and POST
+# /api/uploads/{id}/finalize completes it. Chunks are written into one file
+# under UPLOAD_DIR, and whole CSV records are ingested as soon as they have
+# arrived, so finalizing only has to process the last segment.
+UPLOAD_RECEIVING, UPLOAD_COMPLETE, UPLOAD_FAILED = "receiving", "complete", "failed"
+
+class ChunkedUploadCreateSchema(BaseModel):
+    filename: str
+    size: int
+
+_upload_locks: dict = {}
+_ingest_tasks: set = set()
+
+def _upload_path(upload_id: str) -> str:
+    return os.path.join(UPLOAD_DIR, f"{upload_id}.csv")
+
+def _upload_state(upload: ChunkedUpload) -> dict:
+    state = {
+        "upload_id": upload.id,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.received,
+        "ingested_offset": upload.ingested_offset,
+        "ingested_rows": upload.ingested_rows,
+        "skipped_rows": upload.skipped_rows,
+        "status": upload.status,
+    }
+    if upload.error:
+        state["error"] = upload.error
+    return state
+
+async def _get_upload(db: AsyncSession, upload_id: str) -> ChunkedUpload:
+    upload = (await db.execute(select(ChunkedUpload).where(ChunkedUpload.id == upload_id))).scalar()
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+def _read_range(path: str, start: int, stop: int) -> bytes:
+    with open(path, "rb") as file:
+        file.seek(start)
+        return file.read(stop - start)
+
+def _read_segment(path: str, start: int, received: int, final: bool) -> bytes:
+    """
+    The complete CSV records received from `start`, up to about UPLOAD_SEGMENT_BYTES.
+
+    The segment grows past UPLOAD_SEGMENT_BYTES when a single record is
+    longer. With `final`, a last record without a trailing newline counts as
+    complete.
+    """
+    length = UPLOAD_SEGMENT_BYTES
+    while True:
+        stop = min(received, start + length)
+        data = _read_range(path, start, stop)
+        if final and stop == received:
+            return data
+        end = complete_records_end(data)
+        if end or stop == received:
+            return data[:end]
+        length *= 2
+
+async def ingest_chunked_upload(upload_id: str, final: bool = False) -> None:
+    """
+    Insert the centers of every complete CSV record received so far, one segment per transaction.
+
+    A segment is parsed and geocoded before its transaction opens, so slow
+    geocoding holds no connection. The transaction inserts its rows and
+    advances ingested_offset from the value the segment was read at, so a
+    segment is never inserted twice even if another worker ingests the same
+    upload concurrently; the loser rolls back and moves on to the next
+    segment. With `final`, a last record without a trailing newline is
+    ingested too.
+    """
+    async with _upload_locks.setdefault(upload_id, asyncio.Lock()):
+        while True:
+            async with AsyncSessionLocal() as db:
+                upload = (await db.execute(select(ChunkedUpload).where(ChunkedUpload.id == upload_id))).scalar()
+                if upload is None or upload.status != UPLOAD_RECEIVING:
+                    return
+                await refresh_normalization_rules(db)
+            start = upload.ingested_offset
+            data = await asyncio.to_thread(_read_segment, _upload_path(upload_id), start, upload.received, final)
+            if not data:
+                return
+
+            columns = json.loads(upload.columns) if upload.columns else None
+            try:
+                columns, rows, skipped = await asyncio.to_thread(parse_segment, data, columns)
+            except UploadError as exc:
+                await _fail_upload(upload_id, str(exc))
+                return
+            await geocode_rows(rows)
+
+            async with AsyncSessionLocal() as db:
+                if rows:
+                    await db.execute(insert(CTScanCenter), rows)
+                advanced = await db.execute(
+                    update(ChunkedUpload)
+                    .where(ChunkedUpload.id == upload_id, ChunkedUpload.ingested_offset == start)
+                    .values(
+                        ingested_offset=start + len(data),
+                        ingested_rows=ChunkedUpload.ingested_rows + len(rows),
+                        skipped_rows=ChunkedUpload.skipped_rows + skipped,
+                        columns=json.dumps(columns) if columns is not None else None,
+                    ),
+                    execution_options={"synchronize_session": False},
+                )
+                if advanced.rowcount != 1:
+                    await db.rollback()
+                    continue
+                await db.commit()
+            UPLOAD_ROWS.labels("chunked_upload").inc(len(rows))
+
+async def _fail_upload(upload_id: str, error: str) -> None:
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            update(ChunkedUpload)
+            .where(ChunkedUpload.id == upload_id, ChunkedUpload.status == UPLOAD_RECEIVING)
+            .values(status=UPLOAD_FAILED, error=error)
+        )
+    _upload_locks.pop(upload_id, None)
+
+async def _ingest_or_fail(upload_id: str, final: bool = False) -> None:
+    """Run ingest_chunked_upload, logging an unexpected error and recording it on the upload."""
+    try:
+        await ingest_chunked_upload(upload_id, final)
+    except Exception as exc:
+        log.exception("Ingestion of chunked upload %s failed", upload_id)
+        await _fail_upload(upload_id, f"Ingestion failed: {exc!r}")
+
+def _start_ingestion(upload_id: str) -> None:
+    task = asyncio.create_task(_ingest_or_fail(upload_id))
+    _ingest_tasks.add(task)
+    task.add_done_callback(_ingest_tasks.discard)
+
+@app.post("/api/uploads", status_code=201)
+async def create_chunked_upload(upload: ChunkedUploadCreateSchema, db: AsyncSession = Depends(get_async_db)):
+    if not 0 < upload.size <= UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=400, detail=f"size must be between 1 and {UPLOAD_MAX_BYTES} bytes")
+    if (await db.execute(select(UploadedFile.id).where(UploadedFile.filename == upload.filename))).first():
+        raise HTTPException(status_code=409, detail=f"File '{upload.filename}' has already been uploaded.")
+    upload_id = uuid.uuid4().hex
+    # Core statements on their own connection: upload bookkeeping is not a
+    # change to the centers, so it must not bump the cache generation. The
+    # unique filename reserves it, so a concurrent upload of the same file
+    # is refused here rather than after both have ingested their rows.
+    try:
+        async with async_engine.begin() as conn:
+            await conn.execute(insert(ChunkedUpload).values(id=upload_id, filename=upload.filename, size=upload.size))
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail=f"File '{upload.filename}' is already being uploaded; resume or discard that upload first.",
+        )
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    open(_upload_path(upload_id), "wb").close()
+    return {"upload_id": upload_id, "chunk_size": UPLOAD_CHUNK_SIZE, "offset": 0}
+
+@app.get("/api/uploads/{upload_id}")
+async def get_chunked_upload(upload_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Progress of an upload; resume by sending the next chunk at `offset`."""
+    return _upload_state(await _get_upload(db, upload_id))
+
+@app.put("/api/uploads/{upload_id}")
+async def put_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Write the request body at `offset`.
+
+    Chunks may be resent (overlapping bytes are overwritten with the same
+    data), but must not leave a gap: a chunk starting after the current
+    offset is rejected with 409 and the offset to resume from.
+    """
+    upload = await _get_upload(db, upload_id)
+    received, size, status = upload.received, upload.size, upload.status
+    await db.rollback()
+    if status != UPLOAD_RECEIVING:
+        raise HTTPException(status_code=409, detail=f"Upload is {status}")
+    if offset > received:
+        raise HTTPException(status_code=409, detail={"message": "Chunk would leave a gap", "offset": received})
+
+    end = offset
+    with open(_upload_path(upload_id), "r+b") as file:
+        file.seek(offset)
+        async for data in request.stream():
+            end += len(data)
+            if end > size:
+                raise HTTPException(status_code=413, detail=f"Chunk extends beyond the declared size of {size} bytes")
+            await asyncio.to_thread(file.write, data)
+
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            update(ChunkedUpload)
+            .where(ChunkedUpload.id == upload_id, ChunkedUpload.received >= offset, ChunkedUpload.received < end)
+            .values(received=end)
+        )
+    _start_ingestion(upload_id)
+    return _upload_state(await _get_upload(db, upload_id))
+
+@app.post("/api/uploads/{upload_id}/finalize")
+async def finalize_chunked_upload(upload_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Ingest the remaining records, record the file as uploaded and remove the assembled copy."""
+    upload = await _get_upload(db, upload_id)
+    if upload.status == UPLOAD_COMPLETE:
+        return _upload_state(upload)
+    if upload.status == UPLOAD_FAILED:
+        raise HTTPException(status_code=400, detail=_upload_state(upload))
+    if upload.received < upload.size:
+        raise HTTPException(status_code=409, detail={"message": "Upload is incomplete", "offset": upload.received})
+    filename = upload.filename
+    await db.rollback()
+
+    await _ingest_or_fail(upload_id, final=True)
+    # Only an upload ingested to its last byte is complete; anything else
+    # would silently drop the rows that were not.
+    completed = await db.execute(
+        update(ChunkedUpload)
+        .where(
+            ChunkedUpload.id == upload_id,
+            ChunkedUpload.status == UPLOAD_RECEIVING,
+            ChunkedUpload.ingested_offset == ChunkedUpload.size,
+        )
+        .values(status=UPLOAD_COMPLETE),
+        execution_options={"synchronize_session": False},
+    )
+    if completed.rowcount == 1:
+        db.add(UploadedFile(filename=filename))
+        try:
+            await db.flush()
+        except IntegrityError:
+            # Another kind of upload recorded the same filename meanwhile.
+            await db.rollback()
+            await _fail_upload(upload_id, f"File '{filename}' has already been uploaded.")
+            raise HTTPException(status_code=409, detail=f"File '{filename}' has already been uploaded.")
+    else:
+        await db.execute(
+            update(ChunkedUpload)
+            .where(ChunkedUpload.id == upload_id, ChunkedUpload.status == UPLOAD_RECEIVING)
+            .values(status=UPLOAD_FAILED, error="Ingestion stopped before the end of the file"),
+            execution_options={"synchronize_session": False},
+        )
+    await db.commit()
+    await db.refresh(upload)
+    if upload.status == UPLOAD_FAILED:
+        raise HTTPException(status_code=400, detail=_upload_state(upload))
+
+    _upload_locks.pop(upload_id, None)
+    if os.path.exists(_upload_path(upload_id)):
+        os.unlink(_upload_path(upload_id))
+    return _upload_state(upload)
+
+@app.delete("/api/uploads/{upload_id}")
+async def abort_chunked_upload(upload_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Discard an unfinished upload; centers already ingested from it are kept."""
+    filename = (await _get_upload(db, upload_id)).filename
+    await db.rollback()
+    async with async_engine.begin() as conn:
+        await conn.execute(delete(ChunkedUpload).where(ChunkedUpload.id == upload_id))
+    _upload_locks.pop(upload_id, None)
+    if os.path.exists(_upload_path(upload_id)):
+        os.unlink(_upload_path(upload_id))
+    return {"message": f"Upload of '{filename}' discarded"}
+
 @app.post("/api/refresh-all-data")
-def refresh_all_data(db: Session = Depends(get_db)):
-    all_centers = db.query(CTScanCenter).all()
+async def refresh_all_data(db: AsyncSession = Depends(get_async_db)):
+    await refresh_normalization_rules(db)
+    all_centers = (await db.execute(select(CTScanCenter))).scalars().all()
+    with timed("geocoder"):
+        locations = await geocode_many([center.address for center in all_centers], use_cache=False)
     updated_count = 0
-    for center in all_centers:
-        new_city, new_state = get_city_and_state_from_address(center.address)
-        if new_city != center.city or new_state != center.stored_state:
-            center.city = new_city
-            center.stored_state = new_state
+    for center, location in zip(all_centers, locations):
+        new_values = location_columns(location, center.google_maps_link)
+        if any(getattr(center, column) != value for column, value in new_values.items()):
+            for column, value in new_values.items():
+                setattr(center, column, value)
             updated_count += 1
-    db.commit()
+    await db.commit()
     return {
         "message": f"Refreshed {updated_count} of {len(all_centers)} records.",
         "total_processed": len(all_centers),
@@ -247,23 +1075,142 @@ def refresh_all_data(db: Session = Depends(get_db)):
     }
 
 @app.get("/api/states")
-def get_states(db: Session = Depends(get_db)):
-    states = db.query(CTScanCenter.stored_state).distinct().all()
-    return sorted([state[0] for state in states if state[0] and state[0] != "Unknown State"])
+async def get_states(db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        states = (await db.execute(select(CTScanCenter.stored_state).distinct())).all()
+        return orjson.dumps(sorted([state[0] for state in states if state[0] and state[0] != "Unknown State"]))
+    return await cached_json_response(db, "/api/states", build)
 
 @app.get("/api/centers-by-state/{state_name}", response_model=List[CTScanCenterSchema])
-def get_centers_by_state(state_name: str, db: Session = Depends(get_db)):
-    return db.query(CTScanCenter).filter(CTScanCenter.stored_state == state_name).all()
+async def get_centers_by_state(
+    state_name: str,
+    request: Request,
+    stream: bool = False,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+):
+    statement = select_centers(parse_fields(fields)).where(state_condition(state_name))
+    return await list_response(request, db, statement, stream)
+
+@app.get("/api/export")
+async def export_centers(
+    format: str = Query("csv", description="csv, xlsx or parquet"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    state: str | None = None,
+    city: str | None = None,
+    bbox: str | None = Query(None, description="min_lng,min_lat,max_lng,max_lat"),
+):
+    """Download centers as a file, streamed from the database cursor in batches."""
+    if format not in EXPORT_ENCODERS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_ENCODERS)}")
+    statement = select_centers(parse_fields(fields))
+    if state is not None:
+        statement = statement.where(state_condition(state))
+    if city is not None:
+        statement = statement.where(CTScanCenter.city == city)
+    if bbox:
+        statement = statement.where(within_bbox(async_engine.dialect.name, *_parse_bbox(bbox)))
+
+    try:
+        chunks = EXPORT_ENCODERS[format](statement.selected_columns, iter_rows(statement))
+    except ImportError as exc:
+        raise HTTPException(status_code=501, detail=f"{format} export is not available: {exc}")
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="ct_scan_centers.{format}"'},
+    )
+
+ARROW_FILE_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+_snapshot_lock = asyncio.Lock()
+
+def _snapshot_path(generation: int) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"ct_scan_centers-{generation}.arrow")
+
+async def open_arrow_snapshot(generation: int):
+    """
+    Open the Arrow snapshot of ct_scan_centers for the given cache generation.
+
+    The file is rebuilt on the first request after a write: rows are streamed
+    into a temporary file that is atomically renamed into place, so readers
+    (including other workers sharing SNAPSHOT_DIR) only ever see complete
+    snapshots. Older generations are then removed; a reader that already has
+    one open keeps reading it.
+    """
+    path = _snapshot_path(generation)
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        pass
+    async with _snapshot_lock:
+        if not os.path.exists(path):
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            statement = select_centers()
+            fd, temp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".arrow.tmp")
+            os.close(fd)
+            try:
+                await write_arrow_file(statement.selected_columns, iter_rows(statement), temp_path)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        snapshot = open(path, "rb")
+        for stale in glob.glob(os.path.join(SNAPSHOT_DIR, "ct_scan_centers-*.arrow")):
+            stale_generation = os.path.basename(stale)[len("ct_scan_centers-"):-len(".arrow")]
+            if stale_generation.isdigit() and int(stale_generation) < generation:
+                os.unlink(stale)
+    return snapshot
+
+async def _iter_open_file(file):
+    with file:
+        while chunk := await asyncio.to_thread(file.read, 1024 * 1024):
+            yield chunk
+
+@app.get("/api/snapshot.arrow")
+async def get_arrow_snapshot(db: AsyncSession = Depends(get_async_db)):
+    """
+    Every center as an Arrow IPC file, e.g. for `pyarrow.ipc.open_file(pyarrow.memory_map(path))`.
+
+    The ETag is the cache generation the snapshot was built for.
+    """
+    generation = await current_generation(db)
+    try:
+        snapshot = await open_arrow_snapshot(generation)
+    except ImportError as exc:
+        raise HTTPException(status_code=501, detail=f"Arrow snapshots are not available: {exc}")
+    return StreamingResponse(
+        _iter_open_file(snapshot),
+        media_type=ARROW_FILE_MEDIA_TYPE,
+        headers={
+            "Content-Length": str(os.fstat(snapshot.fileno()).st_size),
+            "Content-Disposition": 'attachment; filename="ct_scan_centers.arrow"',
+            "ETag": f'"{generation}"',
+        },
+    )
 
 @app.delete("/api/centers/{center_id}", status_code=204)
-def delete_center(center_id: int, db: Session = Depends(get_db)):
-    center = db.query(CTScanCenter).filter(CTScanCenter.id == center_id).first()
+async def delete_center(center_id: int, db: AsyncSession = Depends(get_async_db)):
+    center = await db.get(CTScanCenter, center_id)
     if not center:
         raise HTTPException(status_code=404, detail="Center not found")
-    db.delete(center)
-    db.commit()
+    await db.delete(center)
+    await db.commit()
     return
 
+@app.post("/api/centers/bulk-delete")
+async def bulk_delete_centers(delete_request: BulkDeleteSchema, db: AsyncSession = Depends(get_async_db)):
+    requested_ids = set(delete_request.ids)
+    result = await db.execute(
+        delete(CTScanCenter).where(CTScanCenter.id.in_(requested_ids)).returning(CTScanCenter.id),
+        execution_options={"synchronize_session": False},
+    )
+    deleted_ids = set(result.scalars().all())
+    await db.commit()
+    return {
+        "deleted_count": len(deleted_ids),
+        "missing_ids": sorted(requested_ids - deleted_ids),
+    }
+
 
 @app.delete("/api/deduplicate", status_code=200)
 def remove_duplicates(db: Session = Depends(get_db)):
@@ -273,6 +1220,7 @@ def remove_duplicates(db: Session = Depends(get_db)):
     """
     from sqlalchemy import func
 
+    start = time.perf_counter()
     # Find addresses that have duplicates
     duplicate_addresses = (
         db.query(CTScanCenter.address, func.count(CTScanCenter.id).label("count"))
@@ -299,6 +1247,8 @@ def remove_duplicates(db: Session = Depends(get_db)):
             duplicates_removed += len(ids_to_delete)
 
     db.commit()
+    DUPLICATES_FOUND.labels("deduplicate").inc(duplicates_removed)
+    DUPLICATE_JOB_DURATION.labels("deduplicate").observe(time.perf_counter() - start)
     return {"duplicates_removed": duplicates_removed}
 
 
@@ -322,6 +1272,7 @@ def find_potential_duplicates(db: Session = Depends(get_db)):
     log = logging.getLogger(__name__)
 
     try:
+        start = time.perf_counter()
         log.info("Starting potential duplicate analysis...")
 
         def normalize_text(text: str | None) -> str:
@@ -377,6 +1328,9 @@ def find_potential_duplicates(db: Session = Depends(get_db)):
         log.info("Analysis complete. Sorting results.")
         sorted_duplicates = sorted(potential_duplicates, key=lambda x: x.similarity_score, reverse=True)
         log.info(f"Returning {len(sorted_duplicates)} potential duplicate pairs.")
+        DUPLICATE_JOB_CENTERS.labels("potential").inc(len(all_centers))
+        DUPLICATES_FOUND.labels("potential").inc(len(sorted_duplicates))
+        DUPLICATE_JOB_DURATION.labels("potential").observe(time.perf_counter() - start)
         return sorted_duplicates
     except Exception as e:
         log.error(f"An error occurred during duplicate analysis: {e}", exc_info=True)
@@ -415,6 +1369,7 @@ def auto_merge_duplicates(db: Session = Depends(get_db)):
     logging.basicConfig(level=logging.INFO)
     log = logging.getLogger(__name__)
 
+    start = time.perf_counter()
     log.info("Starting automatic duplicate merging process...")
 
     def normalize_text(text: str | None) -> str:
@@ -472,6 +1427,9 @@ def auto_merge_duplicates(db: Session = Depends(get_db)):
     
     db.commit()
     log.info(f"Auto-merge complete. Merged {merged_count} records.")
+    DUPLICATE_JOB_CENTERS.labels("auto_merge").inc(len(all_centers))
+    DUPLICATES_FOUND.labels("auto_merge").inc(merged_count)
+    DUPLICATE_JOB_DURATION.labels("auto_merge").observe(time.perf_counter() - start)
     return {"duplicates_merged": merged_count}
 
 
@@ -0,0 +1,401 @@
+"""
+Maintenance commands for the CT scan center database.
+
+Every command runs against the app's configured database (DATABASE_URL, the
+same engine and migrations as the API), writes with set-based SQL in a single
+transaction per command or batch, and bumps the cache generation so running
+API workers drop their cached responses. Pass --dry-run to report what would
+change and roll everything back.
+
+Usage (from the backend directory):
+    python manage.py state-counts
+    python manage.py states
+    python manage.py rename-state "U P" "Uttar Pradesh"
+    python manage.py set-state --city "Chhatrapati Sambhajinagar" --state Maharashtra
+    python manage.py add-rule state_alias "U.P." "Uttar Pradesh"
+    python manage.py apply-rules --dry-run
+    python manage.py regeocode --unknown-state --checkpoint /tmp/regeocode.json
+    python manage.py reload-csv --dry-run
+    python manage.py check-addresses --limit 10
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+
+import city_utils
+from city_utils import UNKNOWN_LOCATION, aclose_async_client, geocode_many
+from main import CACHE_GENERATION_ROW, engine as app_engine, location_columns
+from models import CacheGeneration, CTScanCenter, NormalizationRule
+from normalization import RULE_KINDS, apply_rules, load_rules
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNKNOWN_CITY = UNKNOWN_LOCATION.city
+UNKNOWN_STATE = UNKNOWN_LOCATION.state
+LOCATION_FIELDS = ("city", "stored_state", "latitude", "longitude", "geohash")
+
+_table = CTScanCenter.__table__
+
+
+class DryRun(Exception):
+    """Raised inside a transaction to roll it back after a dry run."""
+
+
+def _bump_cache_generation(conn: Connection) -> None:
+    conn.execute(
+        update(CacheGeneration)
+        .where(CacheGeneration.id == CACHE_GENERATION_ROW)
+        .values(generation=CacheGeneration.generation + 1)
+    )
+
+
+def _write(engine: Engine, dry_run: bool, work) -> int:
+    """Run `work(conn)` in one transaction; roll it back on a dry run. Returns its row count."""
+    count = 0
+    try:
+        with engine.begin() as conn:
+            count = work(conn)
+            if dry_run:
+                raise DryRun
+            # Also when nothing matched: rule changes must reach the API workers.
+            _bump_cache_generation(conn)
+    except DryRun:
+        pass
+    return count
+
+
+def state_counts(engine: Engine) -> List[tuple]:
+    """(state, center count) pairs, largest first."""
+    statement = (
+        select(func.coalesce(CTScanCenter.stored_state, UNKNOWN_STATE), func.count())
+        .group_by(func.coalesce(CTScanCenter.stored_state, UNKNOWN_STATE))
+        .order_by(func.count().desc())
+    )
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(statement)]
+
+
+def distinct_states(engine: Engine) -> List[str]:
+    statement = select(CTScanCenter.stored_state).distinct().where(
+        CTScanCenter.stored_state.is_not(None), CTScanCenter.stored_state != UNKNOWN_STATE
+    )
+    with engine.connect() as conn:
+        return sorted(conn.execute(statement).scalars())
+
+
+def rename_state(engine: Engine, old: str, new: str, dry_run: bool = False) -> int:
+    """Replace one stored_state value with another; returns the rows changed."""
+    statement = (
+        update(CTScanCenter)
+        .where(CTScanCenter.stored_state == old)
+        .values(stored_state=new, version=CTScanCenter.version + 1)
+    )
+    return _write(engine, dry_run, lambda conn: conn.execute(statement).rowcount)
+
+
+def set_state_for_city(engine: Engine, city: str, state: str, only_unknown: bool = True, dry_run: bool = False) -> int:
+    """Set the state of every center in `city` (by default only those whose state is unknown)."""
+    statement = (
+        update(CTScanCenter)
+        .where(CTScanCenter.city == city)
+        .values(stored_state=state, version=CTScanCenter.version + 1)
+    )
+    if only_unknown:
+        statement = statement.where(
+            or_(CTScanCenter.stored_state.is_(None), CTScanCenter.stored_state == UNKNOWN_STATE)
+        )
+    return _write(engine, dry_run, lambda conn: conn.execute(statement).rowcount)
+
+
+def list_rules(engine: Engine) -> List[tuple]:
+    statement = select(NormalizationRule.kind, NormalizationRule.match, NormalizationRule.value).order_by(
+        NormalizationRule.kind, NormalizationRule.match
+    )
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(statement)]
+
+
+def apply_normalization_rules(engine: Engine, dry_run: bool = False) -> int:
+    """Apply every rule to the stored centers with one UPDATE ... CASE; returns the rows changed."""
+    return _write(engine, dry_run, lambda conn: apply_rules(conn, load_rules(conn)))
+
+
+def add_rule(engine: Engine, kind: str, match: str, value: str, dry_run: bool = False) -> int:
+    """
+    Add a rule (replacing one with the same kind and match, ignoring case) and
+    apply the rules to the stored centers in the same transaction.
+    """
+    if kind not in RULE_KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(RULE_KINDS)}")
+
+    def add(conn: Connection) -> int:
+        conn.execute(delete(NormalizationRule).where(
+            NormalizationRule.kind == kind, func.lower(NormalizationRule.match) == match.strip().lower()
+        ))
+        conn.execute(insert(NormalizationRule).values(kind=kind, match=match.strip(), value=value.strip()))
+        return apply_rules(conn, load_rules(conn))
+
+    return _write(engine, dry_run, add)
+
+
+def remove_rule(engine: Engine, kind: str, match: str, dry_run: bool = False) -> int:
+    """Delete a rule; rows it already rewrote keep their values. Returns the rules deleted."""
+    statement = delete(NormalizationRule).where(
+        NormalizationRule.kind == kind, func.lower(NormalizationRule.match) == match.strip().lower()
+    )
+    return _write(engine, dry_run, lambda conn: conn.execute(statement).rowcount)
+
+
+def _read_checkpoint(path: Optional[str]) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as file:
+        return int(json.load(file)["last_id"])
+
+
+def _write_checkpoint(path: Optional[str], last_id: int) -> None:
+    if not path:
+        return
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"last_id": last_id}, file)
+    os.replace(temp_path, path)
+
+
+async def regeocode(
+    engine: Engine,
+    unknown_city: bool = False,
+    unknown_state: bool = False,
+    batch_size: int = 500,
+    checkpoint: Optional[str] = None,
+    dry_run: bool = False,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """
+    Re-extract the location of centers through Gemini and store the changes.
+
+    Without filters every center is processed; otherwise only those with an
+    unknown city and/or state. Centers are processed in id order, `batch_size`
+    at a time: each batch is geocoded concurrently (GEOCODER_CONCURRENCY) and
+    written in one executemany UPDATE and commit, after which the last id is
+    saved to `checkpoint`, so an interrupted run resumes where it stopped.
+    Lookups that still come back unknown leave the row untouched.
+    """
+    filters = []
+    if unknown_city:
+        filters.append(or_(CTScanCenter.city.is_(None), CTScanCenter.city == UNKNOWN_CITY))
+    if unknown_state:
+        filters.append(or_(CTScanCenter.stored_state.is_(None), CTScanCenter.stored_state == UNKNOWN_STATE))
+    base = select(CTScanCenter.id, CTScanCenter.address, CTScanCenter.google_maps_link, *(
+        _table.c[name] for name in LOCATION_FIELDS
+    )).order_by(CTScanCenter.id).limit(batch_size)
+    if filters:
+        base = base.where(or_(*filters))
+    statement = update(_table).where(_table.c.id == bindparam("center_id")).values(version=_table.c.version + 1)
+
+    last_id = _read_checkpoint(checkpoint)
+    totals = {"processed": 0, "updated": 0}
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(base.where(CTScanCenter.id > last_id)).all()
+        if not rows:
+            break
+        locations = await geocode_many([row.address or "" for row in rows], use_cache=False)
+
+        changes = []
+        for row, location in zip(rows, locations):
+            if location == UNKNOWN_LOCATION:
+                continue
+            values = location_columns(location, row.google_maps_link)
+            if all(getattr(row, name) == value for name, value in values.items()):
+                continue
+            changes.append({"center_id": row.id, **values})
+            if verbose:
+                print(f"{row.id}: {row.city}, {row.stored_state} -> {values['city']}, {values['stored_state']}")
+
+        if changes:
+            _write(engine, dry_run, lambda conn: conn.execute(statement, changes).rowcount)
+        last_id = rows[-1].id
+        totals["processed"] += len(rows)
+        totals["updated"] += len(changes)
+        if not dry_run:
+            _write_checkpoint(checkpoint, last_id)
+        print(f"... {totals['processed']} processed, {totals['updated']} updated (last id {last_id})")
+    return totals
+
+
+def _csv_paths(data_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(data_dir, "CT_Scan_Results_*.csv")))
+
+
+def _read_centers(paths: Sequence[str]) -> List[dict]:
+    centers = []
+    for path in paths:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        for row in df.to_dict("records"):
+            address = (row.get("Address") or "").strip()
+            if not address:
+                continue
+            centers.append({
+                "center_name": row.get("Center Name"),
+                "address": address,
+                "contact_details": row.get("Contact Details"),
+                "google_maps_link": row.get("Google Maps Link"),
+                "notes": row.get("Notes", ""),
+            })
+    return centers
+
+
+async def reload_csv(engine: Engine, data_dir: str = DATA_DIR, dry_run: bool = False) -> int:
+    """
+    Replace every center with the rows of the bundled CT_Scan_Results_*.csv files.
+
+    Each distinct address is geocoded once, concurrently, before the table is
+    touched; the delete and the insert then happen in one transaction, so the
+    API never serves a half-loaded table.
+    """
+    paths = _csv_paths(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"No CT_Scan_Results_*.csv files in {data_dir}")
+    centers = _read_centers(paths)
+    addresses = list(dict.fromkeys(center["address"] for center in centers))
+    located = dict(zip(addresses, await geocode_many(addresses)))
+    for center in centers:
+        center.update(location_columns(located[center["address"]], center["google_maps_link"]))
+
+    def replace(conn: Connection) -> int:
+        # Reloaded rows can get the ids of deleted ones; starting their
+        # versions above every old version keeps a stale If-Match from
+        # matching them.
+        version = (conn.execute(select(func.max(CTScanCenter.version))).scalar() or 0) + 1
+        conn.execute(delete(CTScanCenter))
+        if centers:
+            conn.execute(insert(CTScanCenter), [{**center, "version": version} for center in centers])
+        return len(centers)
+
+    return _write(engine, dry_run, replace)
+
+
+async def check_addresses(data_dir: str = DATA_DIR, limit: int = 10) -> List[tuple]:
+    """(address, Location) for the first `limit` addresses of the bundled CSVs, without touching the database."""
+    addresses = [center["address"] for center in _read_centers(_csv_paths(data_dir))][:limit]
+    return list(zip(addresses, await geocode_many(addresses, use_cache=False)))
+
+
+async def _run_async(coroutine):
+    try:
+        return await coroutine
+    finally:
+        await aclose_async_client()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("state-counts", help="number of centers per state")
+    commands.add_parser("states", help="distinct known states")
+
+    rename = commands.add_parser("rename-state", help="replace one stored state value with another")
+    rename.add_argument("old")
+    rename.add_argument("new")
+
+    set_state = commands.add_parser("set-state", help="set the state of the centers in a city")
+    set_state.add_argument("--city", required=True)
+    set_state.add_argument("--state", required=True)
+    set_state.add_argument("--all", action="store_true", help="also overwrite states that are already known")
+
+    commands.add_parser("rules", help="list the normalization rules")
+    add = commands.add_parser("add-rule", help="add a normalization rule and apply it to the stored centers")
+    add.add_argument("kind", choices=RULE_KINDS)
+    add.add_argument("match")
+    add.add_argument("value")
+    remove = commands.add_parser("remove-rule", help="delete a normalization rule")
+    remove.add_argument("kind", choices=RULE_KINDS)
+    remove.add_argument("match")
+    apply = commands.add_parser("apply-rules", help="apply the normalization rules to the stored centers")
+
+    regeo = commands.add_parser("regeocode", help="re-extract city and state through Gemini")
+    regeo.add_argument("--unknown-city", action="store_true", help="only centers with an unknown city")
+    regeo.add_argument("--unknown-state", action="store_true", help="only centers with an unknown state")
+    regeo.add_argument("--batch-size", type=int, default=500)
+    regeo.add_argument("--concurrency", type=int, help="concurrent Gemini calls (default GEOCODER_CONCURRENCY)")
+    regeo.add_argument("--checkpoint", help="JSON file recording progress; an existing one resumes the run")
+    regeo.add_argument("--verbose", action="store_true", help="print every change")
+
+    reload = commands.add_parser("reload-csv", help="replace all centers with the bundled CSV files")
+    reload.add_argument("--data-dir", default=DATA_DIR)
+
+    check = commands.add_parser("check-addresses", help="print the extraction for a sample of CSV addresses")
+    check.add_argument("--data-dir", default=DATA_DIR)
+    check.add_argument("--limit", type=int, default=10)
+
+    for subparser in (rename, set_state, add, remove, apply, regeo, reload):
+        subparser.add_argument("--dry-run", action="store_true", help="report the changes and roll them back")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, engine: Engine = app_engine) -> int:
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    suffix = " (dry run, nothing written)" if getattr(args, "dry_run", False) else ""
+
+    if args.command == "state-counts":
+        counts = state_counts(engine)
+        for state, count in counts:
+            print(f"{state}: {count}")
+        print(f"Total: {sum(count for _, count in counts)}")
+    elif args.command == "states":
+        print("\n".join(distinct_states(engine)))
+    elif args.command == "rename-state":
+        count = rename_state(engine, args.old, args.new, dry_run=args.dry_run)
+        print(f"Renamed {args.old!r} to {args.new!r} on {count} centers{suffix}")
+    elif args.command == "set-state":
+        count = set_state_for_city(engine, args.city, args.state, only_unknown=not args.all, dry_run=args.dry_run)
+        print(f"Set state {args.state!r} on {count} centers in {args.city!r}{suffix}")
+    elif args.command == "rules":
+        for kind, match, value in list_rules(engine):
+            print(f"{kind}: {match!r} -> {value!r}")
+    elif args.command == "add-rule":
+        count = add_rule(engine, args.kind, args.match, args.value, dry_run=args.dry_run)
+        print(f"Added {args.kind} rule {args.match!r} -> {args.value!r}; normalized {count} centers{suffix}")
+    elif args.command == "remove-rule":
+        count = remove_rule(engine, args.kind, args.match, dry_run=args.dry_run)
+        print(f"Removed {count} rule(s){suffix}")
+    elif args.command == "apply-rules":
+        count = apply_normalization_rules(engine, dry_run=args.dry_run)
+        print(f"Normalized {count} centers{suffix}")
+    elif args.command == "regeocode":
+        if args.concurrency:
+            city_utils.GEOCODER_CONCURRENCY = args.concurrency
+        totals = asyncio.run(_run_async(regeocode(
+            engine,
+            unknown_city=args.unknown_city,
+            unknown_state=args.unknown_state,
+            batch_size=args.batch_size,
+            checkpoint=args.checkpoint,
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+        )))
+        print(f"Updated {totals['updated']} of {totals['processed']} centers{suffix}")
+    elif args.command == "reload-csv":
+        count = asyncio.run(_run_async(reload_csv(engine, args.data_dir, dry_run=args.dry_run)))
+        print(f"Loaded {count} centers{suffix}")
+    elif args.command == "check-addresses":
+        for address, location in asyncio.run(_run_async(check_addresses(args.data_dir, args.limit))):
+            print(f"{address} -> City: {location.city}, State: {location.state}")
+
+    print(f"Done in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
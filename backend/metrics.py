@@ -0,0 +1,151 @@
+"""
+Prometheus metrics for the API, served at /metrics.
+
+When PROMETHEUS_MULTIPROC_DIR is set (required when uvicorn/gunicorn run
+several worker processes), each worker writes its samples to that directory and
+/metrics aggregates all of them; otherwise the default in-process registry is
+used.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.routing import Match
+
+import request_stats
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed while serving one request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500, 1000, float("inf")),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements while serving one request.",
+    ["method", "route"],
+)
+
+GEMINI_LATENCY = Histogram(
+    "gemini_request_duration_seconds",
+    "Latency of Gemini address-extraction calls.",
+    ["client"],
+)
+GEMINI_ERRORS = Counter(
+    "gemini_request_errors_total",
+    "Failed Gemini calls by reason (HTTP status, transport or invalid_response).",
+    ["reason"],
+)
+GEMINI_RATE_LIMITED = Counter("gemini_rate_limited_total", "Gemini calls rejected with HTTP 429.")
+EXTRACTION_TIER_LATENCY = Histogram(
+    "extraction_tier_duration_seconds",
+    "Time spent in each tier of the address-extraction cascade, by model.",
+    ["tier"],
+)
+EXTRACTION_ESCALATIONS = Counter(
+    "extraction_escalations_total",
+    "Answers passed on to the next extraction tier, by model and reason (unknown, low_confidence, pin_mismatch).",
+    ["tier", "reason"],
+)
+EXTRACTION_OUTCOMES = Counter(
+    "extraction_outcomes_total",
+    "Extractions that ended at a tier: accepted, exhausted (the last tier was escalated too) or error.",
+    ["tier", "outcome"],
+)
+GEOCODE_CACHE = Counter("geocode_cache_requests_total", "Address lookups by geocode cache result.", ["result"])
+
+UPLOAD_ROWS = Counter("upload_rows_total", "Center rows ingested, by source.", ["source"])
+UPLOAD_DURATION = Histogram("upload_duration_seconds", "Time to ingest an uploaded file.")
+DUPLICATE_JOB_DURATION = Histogram(
+    "duplicate_job_duration_seconds",
+    "Duration of duplicate detection and removal jobs.",
+    ["job"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, float("inf")),
+)
+DUPLICATE_JOB_CENTERS = Counter("duplicate_job_centers_total", "Centers scanned by duplicate jobs.", ["job"])
+DUPLICATES_FOUND = Counter("duplicates_found_total", "Duplicates removed, merged or reported, by job.", ["job"])
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def metrics_response_body():
+    """(body, content type) for the /metrics endpoint."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def _route_template(app, scope) -> str:
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, in-flight requests and per-request DB usage.
+
+    Requests are labelled with the route template (e.g. /api/centers/{center_id})
+    rather than the raw path, so label cardinality stays bounded. The timer
+    stops when the last body chunk is sent, so streamed responses are measured
+    in full. Responses carry a Server-Timing header with the db, geocoder and
+    serialization time spent before the headers were sent.
+    """
+
+    def __init__(self, app, router_app):
+        self.app = app
+        self.router_app = router_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(self.router_app, scope)
+        status = "500"
+        stats = request_stats.RequestStats()
+        token = request_stats.activate(stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(method, route, status).observe(time.perf_counter() - stats.started)
+            DB_QUERIES_PER_REQUEST.labels(method, route).observe(stats.queries)
+            DB_SECONDS_PER_REQUEST.labels(method, route).observe(stats.db_seconds)
+            in_progress.dec()
+            request_stats.deactivate(token)
@@ -0,0 +1,107 @@
+from sqlalchemy import event, BigInteger, Column, Float, Index, Integer, MetaData, String, Boolean, Table, Text, UniqueConstraint, false
+from sqlalchemy.orm import declarative_base, object_session
+
+from geo_grid import encode_geohash
+
+Base = declarative_base()
+
+
+class UploadedFile(Base):
+    __tablename__ = "uploaded_files"
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String, unique=True, index=True)
+
+
+class CTScanCenter(Base):
+    __tablename__ = "ct_scan_centers"
+    __table_args__ = (
+        # State listing, /api/states (covering) and state+city bulk updates.
+        Index("ix_ct_scan_centers_stored_state_city", "stored_state", "city"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    center_name = Column(String, index=True)
+    address = Column(String, index=True)  # exact-duplicate GROUP BY and lookups
+    contact_details = Column(String)
+    google_maps_link = Column(String)
+    city = Column(String, index=True)
+    validated = Column(Boolean, default=False, server_default=false())
+    qualified = Column(Boolean, default=False, server_default=false())
+    existing_client = Column(Boolean, default=False, server_default=false())
+    not_to_pursue = Column(Boolean, default=False, server_default=false())
+    notes = Column(Text, default="", server_default="")
+    stored_state = Column(String, default=None)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String, index=True)  # grid cells for map clustering, see geo_grid.encode_geohash
+
+    @property
+    def state(self) -> str:
+        return self.stored_state or "Unknown State"
+
+
+@event.listens_for(CTScanCenter, "before_update")
+def _bump_center_version(mapper, connection, target):
+    # Bulk UPDATE statements bump the version explicitly; this covers ORM flushes.
+    if object_session(target).is_modified(target, include_collections=False):
+        target.version = (target.version or 0) + 1
+
+
+def center_geohash(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    return encode_geohash(latitude, longitude)
+
+
+@event.listens_for(CTScanCenter, "before_insert")
+@event.listens_for(CTScanCenter, "before_update")
+def _sync_center_geohash(mapper, connection, target):
+    # Core UPDATEs carry the geohash in their values (see main.location_columns).
+    target.geohash = center_geohash(target.latitude, target.longitude)
+
+
+# SQLite R*Tree over center coordinates, kept in sync by triggers (see the
+# center_coordinates migration). It lives outside Base.metadata because it is a
+# virtual table that create_all and autogenerate must not manage.
+spatial_metadata = MetaData()
+center_rtree = Table(
+    "ct_scan_centers_rtree",
+    spatial_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lng", Float),
+    Column("max_lng", Float),
+)
+
+
+class CacheGeneration(Base):
+    """Single-row counter bumped by every write; invalidates cached reads in all workers."""
+    __tablename__ = "cache_generation"
+    id = Column(Integer, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class NormalizationRule(Base):
+    """A city/state alias or city -> state implication; see normalization.py."""
+    __tablename__ = "normalization_rules"
+    __table_args__ = (UniqueConstraint("kind", "match", name="uq_normalization_rules_kind_match"),)
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    match = Column(String, nullable=False)
+    value = Column(String, nullable=False)
+
+
+class ChunkedUpload(Base):
+    """A resumable CSV upload assembled on disk from chunks; see the /api/uploads endpoints."""
+    __tablename__ = "chunked_uploads"
+    id = Column(String, primary_key=True)
+    filename = Column(String, nullable=False, unique=True, index=True)  # reserved while the upload exists
+    size = Column(BigInteger, nullable=False)
+    received = Column(BigInteger, nullable=False, default=0, server_default="0")  # contiguous bytes on disk
+    ingested_offset = Column(BigInteger, nullable=False, default=0, server_default="0")
+    ingested_rows = Column(Integer, nullable=False, default=0, server_default="0")
+    skipped_rows = Column(Integer, nullable=False, default=0, server_default="0")
+    columns = Column(Text)  # JSON list of the CSV header, once the first record has been read
+    status = Column(String, nullable=False, default="receiving", server_default="receiving")
+    error = Column(Text)
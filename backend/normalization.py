@@ -0,0 +1,130 @@
+"""
+Declarative city/state normalization rules.
+
+Rules live in the normalization_rules table and come in three kinds:
+
+- state_alias: a stored state spelled `match` becomes `value` ("U P" -> "Uttar Pradesh")
+- city_alias: a city spelled `match` becomes `value` ("Aurangabad" -> "Chhatrapati Sambhajinagar")
+- city_state: a center in city `match` whose state is unknown gets state `value`
+
+Matching ignores case and surrounding whitespace. The rules are compiled into
+a RuleSet of dict lookups, applied to every location on its way into the table
+(see main.location_columns), and applied to rows already stored with the single
+UPDATE ... CASE statement built by RuleSet.update_statement().
+
+City -> state implications only fill unknown states: several Indian city names
+exist in more than one state, so they never override a state Gemini returned.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.engine import Connection
+
+from models import CTScanCenter, NormalizationRule
+
+STATE_ALIAS = "state_alias"
+CITY_ALIAS = "city_alias"
+CITY_STATE = "city_state"
+RULE_KINDS = (STATE_ALIAS, CITY_ALIAS, CITY_STATE)
+
+UNKNOWN_STATE = "Unknown State"
+
+
+def _key(value: Optional[str]) -> str:
+    # Mirrors lower(trim(column)) in update_statement().
+    return (value or "").strip().lower()
+
+
+class RuleSet:
+    def __init__(self, rules: Iterable[Tuple[str, str, str]] = (), generation: Optional[int] = None):
+        self.state_aliases: Dict[str, str] = {}
+        self.city_aliases: Dict[str, str] = {}
+        self.city_states: Dict[str, str] = {}
+        self.generation = generation
+        lookups = {STATE_ALIAS: self.state_aliases, CITY_ALIAS: self.city_aliases, CITY_STATE: self.city_states}
+        for kind, match, value in rules:
+            if kind not in lookups:
+                raise ValueError(f"Unknown normalization rule kind {kind!r}; expected one of {', '.join(RULE_KINDS)}")
+            lookups[kind][_key(match)] = value
+
+    def __bool__(self) -> bool:
+        return bool(self.state_aliases or self.city_aliases or self.city_states)
+
+    def normalize(self, city: Optional[str], state: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """The (city, state) pair with every applicable rule applied."""
+        city = self.city_aliases.get(_key(city), city)
+        state = self.state_aliases.get(_key(state), state)
+        if not state or state == UNKNOWN_STATE:
+            state = self.city_states.get(_key(city), state)
+        return city, state
+
+    def normalize_columns(self, values: dict) -> dict:
+        """Apply the rules to the city/stored_state entries of a column-value dict, in place."""
+        city, state = self.normalize(values.get("city"), values.get("stored_state"))
+        if "city" in values:
+            values["city"] = city
+        if "stored_state" in values:
+            values["stored_state"] = state
+        return values
+
+    def update_statement(self):
+        """
+        One UPDATE ... CASE applying every rule to the stored centers, or None without rules.
+
+        The SET expressions see the old row, so the implication for a city
+        also matches every alias that maps to it.
+        """
+        if not self:
+            return None
+        city_key = func.lower(func.trim(CTScanCenter.city))
+        state_key = func.lower(func.trim(CTScanCenter.stored_state))
+        state_unknown = or_(CTScanCenter.stored_state.is_(None), CTScanCenter.stored_state.in_(["", UNKNOWN_STATE]))
+        implied = dict(self.city_states)
+        for alias, city in self.city_aliases.items():
+            if _key(city) in self.city_states:
+                implied.setdefault(alias, self.city_states[_key(city)])
+
+        values = {}
+        if self.city_aliases:
+            values["city"] = case(self.city_aliases, value=city_key, else_=CTScanCenter.city)
+        whens = []
+        if self.state_aliases:
+            whens.append((state_key.in_(self.state_aliases), case(self.state_aliases, value=state_key)))
+        if implied:
+            whens.append((state_unknown & city_key.in_(implied), case(implied, value=city_key)))
+        if whens:
+            values["stored_state"] = case(*whens, else_=CTScanCenter.stored_state)
+        changed = [expression.is_distinct_from(CTScanCenter.__table__.c[column]) for column, expression in values.items()]
+        return (
+            update(CTScanCenter)
+            .where(or_(*changed))
+            .values(**values, version=CTScanCenter.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+RULES_QUERY = select(NormalizationRule.kind, NormalizationRule.match, NormalizationRule.value)
+
+
+def load_rules(conn: Connection, generation: Optional[int] = None) -> RuleSet:
+    return RuleSet(conn.execute(RULES_QUERY).all(), generation)
+
+
+def apply_rules(conn: Connection, rules: RuleSet) -> int:
+    """Normalize every stored center with one statement; returns the rows changed."""
+    statement = rules.update_statement()
+    return conn.execute(statement).rowcount if statement is not None else 0
+
+
+# The rules in force in this process; main refreshes them when the cache
+# generation shows the database may have changed.
+_active_rules = RuleSet()
+
+
+def active_rules() -> RuleSet:
+    return _active_rules
+
+
+def set_active_rules(rules: RuleSet) -> None:
+    global _active_rules
+    _active_rules = rules
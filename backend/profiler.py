@@ -0,0 +1,204 @@
+"""
+On-demand request profiling.
+
+A request that sends `?profile=1` (or `X-Profile: 1`) together with an
+`X-Profile-Token` header matching PROFILER_TOKEN is run under a sampling
+profiler, and the response body is replaced by the profile: a speedscope file
+(https://www.speedscope.app) by default, or folded stacks for flamegraph.pl
+with `profile=collapsed`. Without PROFILER_TOKEN the feature is disabled and
+the middleware only checks for the trigger.
+
+The sampler reads every thread's stack from a background thread every
+PROFILER_INTERVAL_MS, so it covers sync handlers running in the threadpool as
+well as the event loop, adds no per-call overhead to the profiled code, and
+stops after PROFILER_MAX_SECONDS. Only one profile is recorded at a time;
+other requests keep being served, and show up in the profile if they run
+concurrently.
+"""
+import hmac
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import orjson
+
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "60"))
+
+# Leaf frames of threads that are waiting for work rather than doing it.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+Frame = Tuple[str, str, int]  # function, file, first line
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float, max_seconds: float):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.frames: List[Frame] = []
+        self._frame_ids: Dict[Frame, int] = {}
+        # thread name -> (stacks as frame ids from root to leaf, weights in ms)
+        self.samples: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _frame_id(self, frame) -> int:
+        code = frame.f_code
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        frame_id = self._frame_ids.get(key)
+        if frame_id is None:
+            frame_id = self._frame_ids[key] = len(self.frames)
+            self.frames.append(key)
+        return frame_id
+
+    def _run(self) -> None:
+        started = previous = time.perf_counter()
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval) and previous - started < self.max_seconds:
+            now = time.perf_counter()
+            weight = (now - previous) * 1000
+            previous = now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or self._is_idle(frame):
+                    continue
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_id(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                stacks, weights = self.samples.setdefault(names.get(thread_id, str(thread_id)), ([], []))
+                stacks.append(stack)
+                weights.append(weight)
+        self.duration = (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def _is_idle(frame) -> bool:
+        code = frame.f_code
+        return (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES
+
+    def to_speedscope(self, name: str) -> bytes:
+        return orjson.dumps({
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "sales-compass profiler",
+            "shared": {
+                "frames": [{"name": function, "file": file, "line": line} for function, file, line in self.frames]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread_name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": stacks,
+                    "weights": weights,
+                }
+                for thread_name, (stacks, weights) in self.samples.items()
+            ],
+        })
+
+    def to_collapsed(self) -> bytes:
+        """Folded stacks ("thread;outer;inner <ms>") for flamegraph.pl and similar tools."""
+        totals: Dict[str, float] = {}
+        for thread_name, (stacks, weights) in self.samples.items():
+            for stack, weight in zip(stacks, weights):
+                frames = [thread_name] + [
+                    f"{self.frames[i][0]} ({os.path.basename(self.frames[i][1])}:{self.frames[i][2]})" for i in stack
+                ]
+                key = ";".join(frames)
+                totals[key] = totals.get(key, 0.0) + weight
+        return "".join(f"{stack} {round(weight)}\n" for stack, weight in totals.items()).encode("utf-8")
+
+
+class ProfilerMiddleware:
+    """ASGI middleware that serves a profile instead of the response for authorised profiling requests."""
+
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+
+    def _requested_format(self, scope) -> Optional[str]:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        headers = dict(scope.get("headers", []))
+        value = (query.get("profile") or [headers.get(b"x-profile", b"").decode("latin-1")])[0]
+        if value in ("", "0", "false"):
+            return None
+        return "collapsed" if value == "collapsed" else "speedscope"
+
+    async def __call__(self, scope, receive, send):
+        output_format = self._requested_format(scope) if scope["type"] == "http" else None
+        if output_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        supplied = dict(scope.get("headers", [])).get(b"x-profile-token", b"")
+        if not PROFILER_TOKEN or not hmac.compare_digest(supplied, PROFILER_TOKEN.encode("utf-8")):
+            await _send_json(send, 403, {"detail": "Profiling requires a valid X-Profile-Token"})
+            return
+        if not self._lock.acquire(blocking=False):
+            await _send_json(send, 409, {"detail": "Another request is being profiled"})
+            return
+
+        status = 500
+
+        async def discard_response(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = SamplingProfiler(PROFILER_INTERVAL_MS / 1000, PROFILER_MAX_SECONDS)
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, discard_response)
+            finally:
+                profiler.stop()
+        finally:
+            self._lock.release()
+
+        name = f"{scope['method']} {scope['path']}"
+        if output_format == "collapsed":
+            body, media_type, filename = profiler.to_collapsed(), b"text/plain; charset=utf-8", "profile.folded"
+        else:
+            body, media_type, filename = profiler.to_speedscope(name), b"application/json", "profile.speedscope.json"
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", media_type),
+                (b"content-length", str(len(body)).encode()),
+                (b"content-disposition", f'attachment; filename="{filename}"'.encode()),
+                (b"x-profiled-status", str(status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = orjson.dumps(payload)
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
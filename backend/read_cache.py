@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of encoded response bodies, tagged with a generation.
+
+    Every write to the database bumps a shared generation counter, so an entry
+    is only served while its generation matches the current one. Because the
+    counter lives in the database, workers that never saw the write still stop
+    serving stale entries on their next read.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[int, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, generation: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != generation:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, generation: int, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (generation, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key: Hashable) -> None:
+        _, body = self._entries.pop(key)
+        self._size -= len(body)
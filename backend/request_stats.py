@@ -0,0 +1,100 @@
+"""
+Per-request timing: SQL statement counts and durations, geocoder and
+serialization time.
+
+The middleware in metrics.py activates a RequestStats for each request; engine
+events and `timed()` blocks add to it, and the totals are exported as
+Prometheus metrics and a `Server-Timing` response header. Statements slower
+than SLOW_QUERY_MS are logged with their parameters.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from sqlalchemy import event
+
+log = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+_MAX_LOGGED_PARAMETERS = 1000  # characters
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "geocoder_seconds", "serialization_seconds", "started")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.geocoder_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing header, durations in milliseconds."""
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f"geocoder;dur={self.geocoder_seconds * 1000:.1f}",
+            f"serialization;dur={self.serialization_seconds * 1000:.1f}",
+            f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}",
+        ])
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def activate(stats: RequestStats) -> Token:
+    return _current.set(stats)
+
+
+def deactivate(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the block's duration to `<phase>_seconds` of the current request, if any."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        if stats is not None:
+            attribute = f"{phase}_seconds"
+            setattr(stats, attribute, getattr(stats, attribute) + time.perf_counter() - start)
+
+
+def instrument_engine(engine) -> None:
+    """Time the engine's statements, charge them to the current request and log slow ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            log.warning(
+                "Slow SQL statement (%.1f ms): %s; parameters: %s",
+                elapsed * 1000,
+                " ".join(statement.split()),
+                repr(parameters)[:_MAX_LOGGED_PARAMETERS],
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_statement_start(exception_context):
+        # after_cursor_execute does not run for a failed statement.
+        started = exception_context.connection.info.get("statement_started") if exception_context.connection else None
+        if started:
+            started.pop()
@@ -0,0 +1,47 @@
+import math
+from typing import Tuple
+
+from sqlalchemy import and_, select
+
+from models import CTScanCenter, center_rtree
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng) of a box that contains the circle around (lat, lng)."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    d_lng = 180.0 if cos_lat < 1e-9 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return lat - d_lat, lng - d_lng, lat + d_lat, lng + d_lng
+
+
+def within_bbox(dialect_name: str, min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+    """
+    WHERE clause selecting centers whose coordinates fall inside the box.
+
+    On SQLite the candidate ids come from the R*Tree; elsewhere the
+    (latitude, longitude) B-tree index narrows the latitude range.
+    """
+    if dialect_name == "sqlite":
+        return CTScanCenter.id.in_(
+            select(center_rtree.c.id).where(
+                center_rtree.c.max_lat >= min_lat,
+                center_rtree.c.min_lat <= max_lat,
+                center_rtree.c.max_lng >= min_lng,
+                center_rtree.c.min_lng <= max_lng,
+            )
+        )
+    return and_(
+        CTScanCenter.latitude.between(min_lat, max_lat),
+        CTScanCenter.longitude.between(min_lng, max_lng),
+    )
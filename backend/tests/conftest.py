@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# main creates its engines at import time, so point it at a scratch database first.
+_SCRATCH_DIR = tempfile.mkdtemp(prefix='compass_tests_')
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_SCRATCH_DIR, 'test.db')}"
+os.environ["SNAPSHOT_DIR"] = os.path.join(_SCRATCH_DIR, "snapshots")
+os.environ["UPLOAD_DIR"] = os.path.join(_SCRATCH_DIR, "uploads")
+os.environ.pop("GEMINI_API_KEY", None)
+
+
+def _fake_location(address):
+    from city_utils import Location
+    return Location("Pune", "Maharashtra", 18.5204, 73.8567)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import main
+    return main
+
+
+@pytest.fixture(scope="session")
+def seeded_db(app_module):
+    """A small dataset with duplicates, several cities and several states."""
+    db = app_module.SessionLocal()
+    cities = [
+        ("Pune", "Maharashtra", 18.5204, 73.8567),
+        ("Nagpur", "Maharashtra", 21.1458, 79.0882),
+        ("Surat", "Gujarat", 21.1702, 72.8311),
+        ("Unknown", None, None, None),
+    ]
+    for i in range(40):
+        city, state, latitude, longitude = cities[i % len(cities)]
+        db.add(app_module.CTScanCenter(
+            center_name=f"Diagnostic Centre {i}",
+            address=f"{i % 30} Station Road, {city}",
+            contact_details="020 1234 5678",
+            google_maps_link="https://www.google.com/maps/search/?api=1&query=centre",
+            city=city,
+            stored_state=state,
+            notes="",
+            latitude=latitude and latitude + i * 0.001,
+            longitude=longitude and longitude + i * 0.001,
+        ))
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def client(app_module, seeded_db, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    async def fake_async_location(address):
+        return _fake_location(address)
+
+    async def fake_geocode_many(addresses, use_cache=True):
+        return [_fake_location(address) for address in addresses]
+
+    monkeypatch.setattr(app_module, "get_location_from_address", _fake_location)
+    monkeypatch.setattr(app_module, "aget_location_from_address", fake_async_location)
+    monkeypatch.setattr(app_module, "geocode_many", fake_geocode_many)
+    with TestClient(app_module.app) as test_client:
+        yield test_client
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import delete
+
+
+@pytest.fixture
+def centers(app_module, client):
+    """Centers of their own, so the shared seed stays untouched: name -> id."""
+    rows = [
+        ("Bulk Imphal 1", "Imphal", "Manipur"),
+        ("Bulk Imphal 2", "Imphal", "Manipur"),
+        ("Bulk Thoubal", "Thoubal", "Manipur"),
+        ("Bulk Kohima", "Kohima", "Nagaland"),
+        ("Bulk Unknown 1", "Bulkpur", None),
+        ("Bulk Unknown 2", "Bulkpur", ""),
+        ("Bulk Unknown 3", "Bulkpur", "Unknown State"),
+    ]
+    with app_module.SessionLocal() as db:
+        added = [
+            app_module.CTScanCenter(center_name=name, address=f"{name} Road", city=city, stored_state=state)
+            for name, city, state in rows
+        ]
+        db.add_all(added)
+        db.commit()
+        ids = {center.center_name: center.id for center in added}
+    yield ids
+    with app_module.SessionLocal() as db:
+        db.execute(delete(app_module.CTScanCenter).where(app_module.CTScanCenter.id.in_(ids.values())))
+        db.commit()
+
+
+def _by_name(client, centers):
+    return {c["center_name"]: c for c in client.get("/api/centers").json() if c["id"] in centers.values()}
+
+
+def test_bulk_status_by_ids_bumps_versions(client, centers):
+    ids = [centers["Bulk Imphal 1"], centers["Bulk Kohima"]]
+    response = client.post("/api/centers/bulk-status", json={"ids": ids, "qualified": True})
+    assert response.json() == {"updated_count": 2}
+
+    updated = _by_name(client, centers)
+    assert {name for name, c in updated.items() if c["qualified"]} == {"Bulk Imphal 1", "Bulk Kohima"}
+    assert {name for name, c in updated.items() if c["version"] == 2} == {"Bulk Imphal 1", "Bulk Kohima"}
+    # Flags that were not sent are left alone.
+    assert not any(c["validated"] for c in updated.values())
+
+
+def test_bulk_status_by_city_and_state(client, centers):
+    response = client.post("/api/centers/bulk-status", json={"state": "Manipur", "city": "Imphal", "validated": True})
+    assert response.json() == {"updated_count": 2}
+    response = client.post("/api/centers/bulk-status", json={"state": "Manipur", "not_to_pursue": True})
+    assert response.json() == {"updated_count": 3}
+
+    updated = _by_name(client, centers)
+    assert {name for name, c in updated.items() if c["validated"]} == {"Bulk Imphal 1", "Bulk Imphal 2"}
+    assert {name for name, c in updated.items() if c["not_to_pursue"]} == {
+        "Bulk Imphal 1", "Bulk Imphal 2", "Bulk Thoubal",
+    }
+
+
+def test_bulk_status_reaches_the_unknown_state_group(client, centers):
+    unknown = {name for name in centers if name.startswith("Bulk Unknown")}
+    assert {c["center_name"] for c in client.get("/api/centers-by-state/Unknown State").json()} >= unknown
+
+    response = client.post("/api/centers/bulk-status", json={"state": "Unknown State", "city": "Bulkpur", "qualified": True})
+    assert response.json() == {"updated_count": 3}
+    assert {name for name, c in _by_name(client, centers).items() if c["qualified"]} == unknown
+
+
+def test_bulk_status_requires_flags_and_a_selection(client, centers):
+    assert client.post("/api/centers/bulk-status", json={"ids": [centers["Bulk Kohima"]]}).status_code == 400
+    assert client.post("/api/centers/bulk-status", json={"validated": True}).status_code == 400
+
+
+def test_validate_city(client, centers):
+    assert client.put("/api/cities/Imphal/validate").json() == {"updated_count": 2}
+    assert client.put("/api/cities/Bulkpur/validate", params={"state": "Unknown State"}).json() == {"updated_count": 3}
+    assert client.put("/api/cities/Imphal/validate", params={"validated": False}).json() == {"updated_count": 2}
+
+    updated = _by_name(client, centers)
+    assert {name for name, c in updated.items() if c["validated"]} == {
+        "Bulk Unknown 1", "Bulk Unknown 2", "Bulk Unknown 3",
+    }
+    assert updated["Bulk Imphal 1"]["version"] == 3
+
+
+def test_bulk_delete_reports_missing_ids_and_invalidates_reads(client, centers):
+    imphal = [centers["Bulk Imphal 1"], centers["Bulk Imphal 2"]]
+    before = {c["id"] for c in client.get("/api/centers").json()}
+    assert set(imphal) <= before
+    assert client.get("/api/centers-by-state/Manipur").json()
+
+    response = client.post("/api/centers/bulk-delete", json={"ids": [*imphal, 999999]})
+    assert response.json() == {"deleted_count": 2, "missing_ids": [999999]}
+    assert {c["id"] for c in client.get("/api/centers").json()} == before - set(imphal)
+    assert [c["center_name"] for c in client.get("/api/centers-by-state/Manipur").json()] == ["Bulk Thoubal"]
+
+    # Ids deleted earlier are reported as missing.
+    again = client.post("/api/centers/bulk-delete", json={"ids": [imphal[0], centers["Bulk Thoubal"]]})
+    assert again.json() == {"deleted_count": 1, "missing_ids": [imphal[0]]}
+    assert client.get("/api/centers-by-state/Manipur").json() == []
+    assert "Manipur" not in client.get("/api/states").json()
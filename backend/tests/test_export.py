@@ -0,0 +1,69 @@
+import csv
+import io
+import os
+
+import pytest
+
+
+def test_csv_export_applies_list_filters(client):
+    response = client.get("/api/export", params={"format": "csv", "state": "Gujarat", "fields": "id,city,state"})
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="ct_scan_centers.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    expected = client.get("/api/centers-by-state/Gujarat", params={"fields": "id,city,state"}).json()
+    assert [int(row["id"]) for row in rows] == [center["id"] for center in expected]
+    assert {row["state"] for row in rows} == {"Gujarat"}
+
+
+def test_empty_csv_export_has_header(client):
+    response = client.get("/api/export", params={"state": "Nowhere", "fields": "id,city"})
+    assert response.text.strip() == "id,city"
+
+
+def test_parquet_export_matches_json(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = client.get("/api/export", params={"format": "parquet"})
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.to_pylist() == client.get("/api/centers").json()
+
+
+def test_xlsx_export_has_header_and_rows(client):
+    openpyxl = pytest.importorskip("openpyxl")
+    response = client.get("/api/export", params={"format": "xlsx", "fields": "id,center_name"})
+    sheet = openpyxl.load_workbook(io.BytesIO(response.content), read_only=True).worksheets[0]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0] == ("id", "center_name")
+    assert len(rows) - 1 == len(client.get("/api/centers").json())
+
+
+def test_xlsx_export_starts_a_new_sheet_when_one_is_full(client, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr("exporters.XLSX_MAX_ROWS", 4)
+    monkeypatch.setattr("main.STREAM_BATCH_SIZE", 2)  # rows appended over several batches
+    response = client.get("/api/export", params={"format": "xlsx", "state": "Gujarat", "fields": "id"})
+    sheets = openpyxl.load_workbook(io.BytesIO(response.content), read_only=True).worksheets
+    rows = [list(sheet.iter_rows(values_only=True)) for sheet in sheets]
+    assert all(sheet_rows[0] == ("id",) and len(sheet_rows) <= 4 for sheet_rows in rows)
+    expected = [center["id"] for center in client.get("/api/centers-by-state/Gujarat", params={"fields": "id"}).json()]
+    assert [row[0] for sheet_rows in rows for row in sheet_rows[1:]] == expected
+    assert len(sheets) == -(-len(expected) // 3)
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/api/export", params={"format": "xml"}).status_code == 400
+
+
+def test_arrow_snapshot_is_rebuilt_after_writes(client, app_module):
+    ipc = pytest.importorskip("pyarrow.ipc")
+    first = client.get("/api/snapshot.arrow")
+    assert first.status_code == 200
+    assert ipc.open_file(first.content).read_all().to_pylist() == client.get("/api/centers").json()
+    assert client.get("/api/snapshot.arrow").headers["etag"] == first.headers["etag"]
+
+    center = client.get("/api/centers", params={"fields": "id"}).json()[0]
+    client.patch(f"/api/centers/{center['id']}", json={"notes": "snapshot check"})
+    second = client.get("/api/snapshot.arrow")
+    assert second.headers["etag"] != first.headers["etag"]
+    rows = {row["id"]: row for row in ipc.open_file(second.content).read_all().to_pylist()}
+    assert rows[center["id"]]["notes"] == "snapshot check"
+    assert len(os.listdir(app_module.SNAPSHOT_DIR)) == 1
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+LIST_URLS = ["/api/centers", "/api/centers-by-state/Maharashtra"]
+
+
+@pytest.mark.parametrize("url", LIST_URLS)
+def test_streamed_array_matches_buffered_response(app_module, client, monkeypatch, url):
+    monkeypatch.setattr(app_module, "STREAM_BATCH_SIZE", 3)  # several batches
+    buffered = client.get(url)
+    streamed = client.get(url, params={"stream": 1})
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/json"
+    assert streamed.content == buffered.content
+    assert len(buffered.json()) > 3
+
+
+@pytest.mark.parametrize("url", LIST_URLS)
+def test_ndjson_has_one_object_per_line(app_module, client, monkeypatch, url):
+    monkeypatch.setattr(app_module, "STREAM_BATCH_SIZE", 3)
+    response = client.get(url, headers={"Accept": "application/x-ndjson"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.endswith("\n")
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == client.get(url).json()
+
+
+def test_empty_result_streams_valid_documents(client):
+    url = "/api/centers-by-state/Nowhere"
+    assert client.get(url, params={"stream": 1}).json() == []
+    assert client.get(url, headers={"Accept": "application/x-ndjson"}).text == ""
+
+
+@pytest.mark.parametrize("url", [*LIST_URLS, "/api/centers/in-bbox?bbox=72.5,18,80,22"])
+def test_fields_select_only_the_listed_columns(client, url):
+    fields = "id,center_name,city,state,validated"
+    projected = client.get(url, params={"fields": f"{fields},city, id"}).json()
+    full = {center["id"]: center for center in client.get(url).json()}
+    assert projected
+    for center in projected:
+        assert list(center) == fields.split(",")
+        assert center == {key: full[center["id"]][key] for key in center}
+
+    streamed = client.get(url, params={"fields": fields}, headers={"Accept": "application/x-ndjson"})
+    assert [json.loads(line) for line in streamed.text.splitlines()] == projected
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/api/centers", params={"fields": "id,password"})
+    assert response.status_code == 400
+    assert "Unknown field(s): password" in response.json()["detail"]
+    assert client.get("/api/centers", params={"fields": "id,password", "stream": 1}).status_code == 400
@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import insert, select
+
+from city_utils import UNKNOWN_LOCATION, Location
+from database import create_app_engine, run_migrations
+from models import CacheGeneration, CTScanCenter
+
+
+@pytest.fixture
+def manage(app_module):
+    import manage
+    return manage
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'manage.db'}", sqlite_pragmas={})
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(CTScanCenter), [
+            {"center_name": "A", "address": "1 MG Road, Pune", "city": "Pune", "stored_state": "Maharashtra"},
+            {"center_name": "B", "address": "2 Civil Lines, Lucknow", "city": "Lucknow", "stored_state": "U P"},
+            {"center_name": "C", "address": "3 Jalna Road, Sambhajinagar", "city": "Chhatrapati Sambhajinagar",
+             "stored_state": "Unknown State"},
+            {"center_name": "D", "address": "4 Somewhere", "city": "Unknown", "stored_state": "Unknown State"},
+        ])
+    yield engine
+    engine.dispose()
+
+
+def _states(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(select(CTScanCenter.center_name, CTScanCenter.stored_state)).all())
+
+
+def _versions(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(select(CTScanCenter.center_name, CTScanCenter.version)).all())
+
+
+def _generation(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(CacheGeneration.generation)).scalar()
+
+
+def test_rename_state_dry_run_rolls_back(manage, engine):
+    generation = _generation(engine)
+    assert manage.rename_state(engine, "U P", "Uttar Pradesh", dry_run=True) == 1
+    assert _states(engine)["B"] == "U P"
+    assert _generation(engine) == generation
+
+    assert manage.rename_state(engine, "U P", "Uttar Pradesh") == 1
+    assert _states(engine)["B"] == "Uttar Pradesh"
+    assert _generation(engine) == generation + 1
+    # Core writes bump the row version themselves, so stale If-Match headers fail.
+    assert _versions(engine) == {"A": 1, "B": 2, "C": 1, "D": 1}
+
+
+def test_set_state_only_touches_unknown_states(manage, engine):
+    assert manage.set_state_for_city(engine, "Chhatrapati Sambhajinagar", "Maharashtra") == 1
+    assert manage.set_state_for_city(engine, "Pune", "Goa") == 0
+    assert _states(engine)["C"] == "Maharashtra"
+    assert _versions(engine)["C"] == 2
+    assert manage.state_counts(engine)[0] == ("Maharashtra", 2)
+
+
+def test_regeocode_unknowns_with_checkpoint(manage, engine, tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_geocode_many(addresses, use_cache=True):
+        calls.append(list(addresses))
+        return [
+            UNKNOWN_LOCATION if "Somewhere" in address else Location("Aurangabad", "Maharashtra", 19.87, 75.34)
+            for address in addresses
+        ]
+
+    monkeypatch.setattr(manage, "geocode_many", fake_geocode_many)
+    checkpoint = tmp_path / "checkpoint.json"
+    totals = asyncio.run(manage.regeocode(engine, unknown_state=True, batch_size=1, checkpoint=str(checkpoint)))
+
+    assert totals == {"processed": 2, "updated": 1}
+    assert calls == [["3 Jalna Road, Sambhajinagar"], ["4 Somewhere"]]
+    assert _states(engine)["C"] == "Maharashtra"
+    assert _states(engine)["D"] == "Unknown State"
+    assert _versions(engine) == {"A": 1, "B": 1, "C": 2, "D": 1}
+    last_id = json.loads(checkpoint.read_text())["last_id"]
+
+    # A rerun with the same checkpoint resumes after the last processed center.
+    assert asyncio.run(manage.regeocode(engine, unknown_state=True, checkpoint=str(checkpoint))) == {
+        "processed": 0, "updated": 0,
+    }
+    assert json.loads(checkpoint.read_text())["last_id"] == last_id
+
+
+def test_reload_csv_versions_exceed_replaced_rows(manage, engine, tmp_path, monkeypatch):
+    async def fake_geocode_many(addresses, use_cache=True):
+        return [Location("Pune", "Maharashtra", 18.52, 73.85) for _ in addresses]
+
+    monkeypatch.setattr(manage, "geocode_many", fake_geocode_many)
+    manage.rename_state(engine, "U P", "Uttar Pradesh")
+    (tmp_path / "CT_Scan_Results_PUNE.csv").write_text(
+        "Center Name,Address,Contact Details,Google Maps Link,Notes\n"
+        "E,5 FC Road Pune,020 1111 2222,https://maps.google.com/?q=e,\n"
+    )
+    assert asyncio.run(manage.reload_csv(engine, data_dir=str(tmp_path))) == 1
+    assert _states(engine) == {"E": "Maharashtra"}
+    # The new row may reuse an old id, so its version starts above every old one.
+    assert _versions(engine) == {"E": 3}
@@ -0,0 +1,119 @@
+import re
+
+import requests
+
+import city_utils
+
+
+def _sample(text, name, **labels):
+    selector = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{name}{{{re.escape(selector)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_metrics_label_requests_by_route_template(client):
+    client.patch("/api/centers/1/notes", json={"notes": "metrics"})
+    body = client.get("/metrics").text
+
+    labels = {"method": "PATCH", "route": "/api/centers/{center_id}/notes"}
+    assert _sample(body, "http_request_duration_seconds_count", **labels, status="200") >= 1
+    assert _sample(body, "http_request_db_queries_count", **labels) >= 1
+    assert _sample(body, "http_request_db_queries_sum", **labels) >= 1
+    assert _sample(body, "http_requests_in_progress", **labels) == 0
+    assert "/api/centers/1/notes" not in body
+
+
+class _FakeGeminiResponse:
+    def __init__(self, status_code, text='{"city": "Pune", "state": "Maharashtra"}'):
+        self.status_code = status_code
+        self._text = text
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def json(self):
+        return {"candidates": [{"content": {"parts": [{"text": self._text}]}}]}
+
+
+def test_geocode_cache_and_gemini_error_metrics(client, monkeypatch):
+    from metrics import GEMINI_RATE_LIMITED, GEOCODE_CACHE
+
+    responses = [_FakeGeminiResponse(429), _FakeGeminiResponse(200)]
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(city_utils.requests, "post", lambda *args, **kwargs: responses.pop(0))
+    city_utils.clear_geocode_cache()
+    rate_limited = GEMINI_RATE_LIMITED._value.get()
+    hits = GEOCODE_CACHE.labels("hit")._value.get()
+
+    assert city_utils.get_location_from_address("1 MG Road, Pune") == city_utils.UNKNOWN_LOCATION
+    assert city_utils.get_location_from_address("1 MG Road, Pune").city == "Pune"
+    assert city_utils.get_location_from_address("1  mg road, pune").city == "Pune"
+
+    assert responses == []
+    assert GEMINI_RATE_LIMITED._value.get() == rate_limited + 1
+    assert GEOCODE_CACHE.labels("hit")._value.get() == hits + 1
+
+
+def test_extraction_cascade_escalates_only_doubtful_answers(client, monkeypatch):
+    from metrics import EXTRACTION_ESCALATIONS, EXTRACTION_OUTCOMES
+
+    cheap, strong = (tier.model for tier in city_utils.EXTRACTION_TIERS)
+    answers = {
+        # The cheap tier puts a Maharashtra PIN code in Gujarat.
+        (cheap, "Shop 4, Nashik Road, Nashik, Maharashtra 422101"): '{"city": "Nashik", "state": "Gujarat", "confidence": 0.9}',
+        (strong, "Shop 4, Nashik Road, Nashik, Maharashtra 422101"): '{"city": "Nashik", "state": "Maharashtra", "confidence": 0.95}',
+        (cheap, "1 FC Road, Pune 411004"): '{"city": "Pune", "state": "Maharashtra", "confidence": 0.95}',
+    }
+    calls = []
+
+    def fake_post(url, json=None, **kwargs):
+        model = url.split("/models/")[1].split(":")[0]
+        address = json["contents"][0]["parts"][0]["text"].split('"')[1]
+        calls.append((model, json["generationConfig"].get("thinkingConfig")))
+        return _FakeGeminiResponse(200, answers[(model, address)])
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(city_utils.requests, "post", fake_post)
+    escalated = EXTRACTION_ESCALATIONS.labels(cheap, "pin_mismatch")._value.get()
+    accepted = EXTRACTION_OUTCOMES.labels(cheap, "accepted")._value.get()
+
+    location = city_utils.get_location_from_address("Shop 4, Nashik Road, Nashik, Maharashtra 422101", use_cache=False)
+    assert (location.city, location.state) == ("Nashik", "Maharashtra")
+    assert calls == [(cheap, {"thinkingBudget": 0}), (strong, None)]
+
+    calls.clear()
+    assert city_utils.get_location_from_address("1 FC Road, Pune 411004", use_cache=False).city == "Pune"
+    assert [model for model, _ in calls] == [cheap]
+
+    assert EXTRACTION_ESCALATIONS.labels(cheap, "pin_mismatch")._value.get() == escalated + 1
+    assert EXTRACTION_OUTCOMES.labels(cheap, "accepted")._value.get() == accepted + 1
+
+
+def test_pin_check_accepts_common_state_spellings():
+    answers = [
+        ("12 Connaught Place, New Delhi 110001", "New Delhi", "Delhi NCR"),
+        ("Residency Road, Srinagar 190001", "Srinagar", "Jammu & Kashmir"),
+        ("Naroli Road, Silvassa 396230", "Silvassa", "Dadra and Nagar Haveli and Daman and Diu"),
+    ]
+    for address, city, state in answers:
+        location = city_utils.Location(city, city_utils._normalise_state_name(state))
+        assert city_utils._escalation_reason(address, city_utils.Extraction(location, 0.9)) is None, state
+
+
+def test_server_timing_reports_db_time_and_query_count(client):
+    response = client.get("/api/centers", params={"fields": "id"})
+    timings = dict(entry.split(";", 1) for entry in response.headers["server-timing"].split(", "))
+    assert set(timings) == {"db", "geocoder", "serialization", "app"}
+    queries = int(re.search(r'desc="(\d+) queries"', timings["db"]).group(1))
+    assert queries >= 1
+
+
+def test_slow_statements_are_logged_with_parameters(client, monkeypatch, caplog):
+    import request_stats
+
+    monkeypatch.setattr(request_stats, "SLOW_QUERY_MS", 0)
+    with caplog.at_level("WARNING", logger="request_stats"):
+        client.get("/api/centers-by-state/Gujarat", params={"fields": "id"})
+    slow = [record.getMessage() for record in caplog.records if record.name == "request_stats"]
+    assert any("ct_scan_centers.stored_state = ?" in message and "'Gujarat'" in message for message in slow)
@@ -0,0 +1,59 @@
+from sqlalchemy import insert, select
+
+from city_utils import Location
+from database import create_app_engine, run_migrations
+from models import CTScanCenter
+from normalization import CITY_ALIAS, CITY_STATE, STATE_ALIAS, RuleSet, apply_rules, load_rules
+
+RULES = RuleSet([
+    (STATE_ALIAS, "U P", "Uttar Pradesh"),
+    (CITY_ALIAS, "Aurangabad", "Chhatrapati Sambhajinagar"),
+    (CITY_STATE, "Chhatrapati Sambhajinagar", "Maharashtra"),
+])
+
+
+def test_normalize_applies_aliases_then_implications():
+    assert RULES.normalize("Lucknow", " u p ") == ("Lucknow", "Uttar Pradesh")
+    assert RULES.normalize("aurangabad", "Unknown State") == ("Chhatrapati Sambhajinagar", "Maharashtra")
+    # An implication never overrides a known state.
+    assert RULES.normalize("Chhatrapati Sambhajinagar", "Bihar") == ("Chhatrapati Sambhajinagar", "Bihar")
+    assert RULES.normalize_columns({"city": "Aurangabad"}) == {"city": "Chhatrapati Sambhajinagar"}
+
+
+def test_update_statement_normalizes_stored_rows(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'rules.db'}", sqlite_pragmas={})
+    run_migrations(engine)
+    rows = [
+        ("A", "Lucknow", "U P"),
+        ("B", "Aurangabad", "Unknown State"),
+        ("C", "Aurangabad", "Bihar"),
+        ("D", "Pune", "Maharashtra"),
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(CTScanCenter), [
+            {"center_name": name, "city": city, "stored_state": state} for name, city, state in rows
+        ])
+        assert apply_rules(conn, RULES) == 3
+        stored = {
+            row.center_name: (row.city, row.stored_state, row.version)
+            for row in conn.execute(select(CTScanCenter.center_name, CTScanCenter.city,
+                                           CTScanCenter.stored_state, CTScanCenter.version))
+        }
+        # The migration seeds the rules the one-off scripts used to apply.
+        seeded = load_rules(conn)
+    engine.dispose()
+
+    assert stored == {
+        "A": ("Lucknow", "Uttar Pradesh", 2),
+        "B": ("Chhatrapati Sambhajinagar", "Maharashtra", 2),
+        "C": ("Chhatrapati Sambhajinagar", "Bihar", 2),
+        "D": ("Pune", "Maharashtra", 1),
+    }
+    assert seeded.state_aliases == {"u p": "Uttar Pradesh"}
+    assert seeded.city_states == {"chhatrapati sambhajinagar": "Maharashtra"}
+
+
+def test_location_columns_apply_active_rules(app_module, monkeypatch):
+    monkeypatch.setattr("normalization._active_rules", RULES)
+    columns = app_module.location_columns(Location("Aurangabad", "Unknown State"))
+    assert (columns["city"], columns["stored_state"]) == ("Chhatrapati Sambhajinagar", "Maharashtra")
@@ -0,0 +1,76 @@
+import pytest
+
+
+@pytest.fixture
+def center(app_module, client):
+    """A center of its own, so the shared seed stays untouched for other tests."""
+    db = app_module.SessionLocal()
+    center = app_module.CTScanCenter(
+        center_name="Patch Test Centre", address="7 Ring Road, Nagpur", contact_details="0712 000 0000",
+        city="Nagpur", stored_state="Maharashtra", validated=True, qualified=True, notes="first call",
+    )
+    db.add(center)
+    db.commit()
+    center_id = center.id
+    db.close()
+    yield client.get(f"/api/centers/{center_id}").json()
+    client.delete(f"/api/centers/{center_id}")
+
+
+def test_get_and_patch_return_the_version_as_etag(client, center):
+    url = f"/api/centers/{center['id']}"
+    response = client.get(url)
+    assert response.headers["etag"] == f'"{center["version"]}"'
+
+    patched = client.patch(url, json={"notes": "second call"})
+    assert patched.status_code == 200
+    assert patched.json()["version"] == center["version"] + 1
+    assert patched.headers["etag"] == f'"{center["version"] + 1}"'
+    assert client.get("/api/centers/999999").status_code == 404
+
+
+def test_merge_patch_writes_only_supplied_fields(client, center):
+    url = f"/api/centers/{center['id']}"
+    patched = client.patch(url, json={"contact_details": " 0712 111 1111 ", "qualified": None}).json()
+
+    assert patched["contact_details"] == "0712 111 1111"
+    assert patched["qualified"] is False  # a null flag is cleared to its default
+    unchanged = {key: value for key, value in patched.items() if key not in ("contact_details", "qualified", "version")}
+    assert unchanged == {key: center[key] for key in unchanged}
+
+    notes = client.patch(f"{url}/notes", json={"notes": "left a message"}).json()
+    assert notes["notes"] == "left a message" and notes["validated"] is True
+
+
+def test_if_match_detects_lost_updates(client, center):
+    url = f"/api/centers/{center['id']}"
+    stale = f'"{center["version"]}"'
+    assert client.patch(url, json={"notes": "first"}, headers={"If-Match": stale}).status_code == 200
+
+    conflict = client.patch(url, json={"notes": "second"}, headers={"If-Match": stale})
+    assert conflict.status_code == 412
+    assert client.patch(f"{url}/notes", json={"notes": "second"}, headers={"If-Match": stale}).status_code == 412
+    assert client.get(url).json()["notes"] == "first"
+
+    current = client.get(url).headers["etag"]
+    accepted = client.patch(url, json={"notes": "second"}, headers={"If-Match": current})
+    assert accepted.status_code == 200 and accepted.json()["version"] == center["version"] + 2
+    assert client.patch("/api/centers/999999", json={"notes": "x"}, headers={"If-Match": '"1"'}).status_code == 404
+    assert client.patch(url, json={"notes": "x"}, headers={"If-Match": "not-a-version"}).status_code == 400
+
+
+def test_geocoder_runs_only_when_the_address_changes(app_module, client, center, monkeypatch):
+    looked_up = []
+
+    async def fake_location(address):
+        looked_up.append(address)
+        return app_module.Location("Pune", "Maharashtra", 18.5204, 73.8567)
+
+    monkeypatch.setattr(app_module, "aget_location_from_address", fake_location)
+    url = f"/api/centers/{center['id']}"
+    assert client.patch(url, json={"address": f" {center['address']} ", "notes": "same place"}).status_code == 200
+    assert looked_up == []
+
+    moved = client.patch(url, json={"address": "12 FC Road, Pune"}).json()
+    assert looked_up == ["12 FC Road, Pune"]
+    assert (moved["city"], moved["state"], moved["latitude"]) == ("Pune", "Maharashtra", 18.5204)
@@ -0,0 +1,37 @@
+import orjson
+import pytest
+
+
+@pytest.fixture
+def profiled_client(client, monkeypatch):
+    monkeypatch.setattr("profiler.PROFILER_TOKEN", "secret")
+    monkeypatch.setattr("profiler.PROFILER_INTERVAL_MS", 0.1)
+    return client
+
+
+def test_profile_requires_token(profiled_client):
+    assert profiled_client.get("/api/states", params={"profile": 1}).status_code == 403
+    assert profiled_client.get("/api/states", params={"profile": 1}, headers={"X-Profile-Token": "nope"}).status_code == 403
+    assert profiled_client.get("/api/states").status_code == 200
+
+
+def test_profile_returns_speedscope_file(profiled_client):
+    response = profiled_client.get(
+        "/api/potential-duplicates", params={"profile": 1}, headers={"X-Profile-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    profile = orjson.loads(response.content)
+    assert profile["name"] == "GET /api/potential-duplicates"
+    names = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert "find_potential_duplicates" in names
+    for thread_profile in profile["profiles"]:
+        assert len(thread_profile["samples"]) == len(thread_profile["weights"])
+
+
+def test_profile_collapsed_format(profiled_client):
+    response = profiled_client.get(
+        "/api/potential-duplicates", headers={"X-Profile": "collapsed", "X-Profile-Token": "secret"}
+    )
+    assert response.headers["content-type"].startswith("text/plain")
+    assert any("find_potential_duplicates" in line for line in response.text.splitlines())
@@ -0,0 +1,81 @@
+"""
+Runs each endpoint against SQLite, records every statement it issues and checks
+the statement's EXPLAIN QUERY PLAN, so a dropped or unusable index shows up as a
+test failure instead of a slow endpoint.
+"""
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# A plan step like "SCAN ct_scan_centers" reads the whole table; index scans
+# ("SCAN t USING COVERING INDEX ...") and searches are fine.
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+STATUS = {"validated": True, "qualified": False, "existing_client": False, "not_to_pursue": False}
+
+# Small lookup tables that are read whole by design (the normalization rules
+# are recompiled after writes).
+LOOKUP_TABLES = {"normalization_rules"}
+
+# (method, url, json body, tables allowed to be scanned in full). Only
+# endpoints that return or process every row may scan ct_scan_centers.
+ENDPOINT_CALLS = [
+    ("GET", "/api/centers", None, {"ct_scan_centers"}),
+    ("GET", "/api/centers?fields=id,center_name,city,state,validated", None, {"ct_scan_centers"}),
+    ("GET", "/api/centers-by-state/Maharashtra", None, set()),
+    ("GET", "/api/centers-by-state/Maharashtra?fields=id,city", None, set()),
+    ("GET", "/api/states", None, set()),
+    ("GET", "/api/centers/nearby?lat=18.52&lng=73.85&radius_km=10", None, set()),
+    ("GET", "/api/centers/in-bbox?bbox=72.5,18,80,22", None, set()),
+    ("GET", "/api/centers/2", None, set()),
+    # Aggregates the whole map once per cache generation; panning hits the cache.
+    ("GET", "/api/map/clusters?zoom=8&bbox=72.5,18,80,22", None, {"ct_scan_centers"}),
+    ("PUT", "/api/centers/1/status", STATUS, set()),
+    ("PATCH", "/api/centers/2", {"notes": "called back"}, set()),
+    ("PATCH", "/api/centers/2", {"address": "99 New Road, Pune"}, set()),
+    ("PATCH", "/api/centers/3/notes", {"notes": "follow up"}, set()),
+    ("POST", "/api/centers/bulk-status", {"ids": [4, 5, 6], "qualified": True}, set()),
+    ("POST", "/api/centers/bulk-status", {"state": "Gujarat", "city": "Surat", "not_to_pursue": True}, set()),
+    ("PUT", "/api/cities/Nagpur/validate?validated=true", None, set()),
+    ("POST", "/api/centers/bulk-delete", {"ids": [38, 39]}, set()),
+    ("DELETE", "/api/centers/37", None, set()),
+    ("DELETE", "/api/deduplicate", None, set()),
+]
+
+
+@contextmanager
+def recorded_statements(app_module):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    engines = [app_module.engine, app_module.async_engine.sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+
+def full_scans(app_module, statement, parameters):
+    with app_module.engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return {match.group(1) for *_, detail in plan if (match := FULL_SCAN.match(detail))}
+
+
+@pytest.mark.parametrize("method, url, body, allowed_scans", ENDPOINT_CALLS)
+def test_endpoint_queries_use_indexes(app_module, client, method, url, body, allowed_scans):
+    with recorded_statements(app_module) as statements:
+        response = client.request(method, url, json=body)
+    assert response.status_code < 400, response.text
+    assert statements, "endpoint issued no queries"
+
+    for statement, parameters in statements:
+        scanned = full_scans(app_module, statement, parameters) - allowed_scans - LOOKUP_TABLES
+        assert not scanned, f"full scan of {sorted(scanned)} in: {statement}"
@@ -0,0 +1,75 @@
+from sqlalchemy import delete, update
+
+CSV_HEADER = "Center Name,Address,Contact Details,Google Maps Link,Notes\n"
+
+
+def _snapshot(client):
+    """The cached read endpoints, keyed for comparison."""
+    centers = {c["id"]: c for c in client.get("/api/centers").json()}
+    return {
+        "states": client.get("/api/states").json(),
+        "tripura": sorted(c["id"] for c in client.get("/api/centers-by-state/Tripura").json()),
+        "centers": centers,
+    }
+
+
+def test_writes_invalidate_cached_reads(app_module, client, monkeypatch):
+    db = app_module.SessionLocal()
+    center = app_module.CTScanCenter(
+        center_name="Cache Test Centre", address="MG Marg, Gangtok", city="Gangtok", stored_state="Sikkim",
+    )
+    db.add(center)
+    db.commit()
+    center_id = center.id
+    db.close()
+
+    try:
+        before = _snapshot(client)
+        assert "Sikkim" in before["states"] and "Tripura" not in before["states"]
+
+        client.patch(f"/api/centers/{center_id}", json={"state": "Tripura"})
+        after_patch = _snapshot(client)
+        assert "Tripura" in after_patch["states"] and "Sikkim" not in after_patch["states"]
+        assert after_patch["tripura"] == [center_id]
+        assert after_patch["centers"][center_id]["state"] == "Tripura"
+
+        client.post("/api/centers/bulk-status", json={"ids": [center_id], "qualified": True})
+        assert _snapshot(client)["centers"][center_id]["qualified"] is True
+
+        async def fake_geocode_many(addresses, use_cache=True):
+            return [app_module.Location("Agartala", "Tripura", 23.83, 91.28) for _ in addresses]
+
+        monkeypatch.setattr(app_module, "geocode_many", fake_geocode_many)
+        csv = CSV_HEADER + "Cache Upload Centre,Hospital Road Agartala,0381 000 0000,https://maps.google.com/?q=x,\n"
+        assert client.post("/api/upload/batch", files=[("files", ("cache_check.csv", csv.encode()))]).status_code == 200
+        after_upload = _snapshot(client)
+        uploaded = [c["id"] for c in after_upload["centers"].values() if c["center_name"] == "Cache Upload Centre"]
+        assert len(after_upload["centers"]) == len(before["centers"]) + 1
+        assert after_upload["tripura"] == sorted([center_id, *uploaded])
+    finally:
+        with app_module.SessionLocal() as db:
+            db.execute(delete(app_module.CTScanCenter).where(
+                app_module.CTScanCenter.center_name.in_(["Cache Test Centre", "Cache Upload Centre"])
+            ))
+            db.commit()
+
+
+def test_core_writes_are_seen_after_an_explicit_generation_bump(app_module, client):
+    CTScanCenter, CacheGeneration = app_module.CTScanCenter, app_module.CacheGeneration
+    notes = client.get("/api/centers").json()[0]
+    center_id, original = notes["id"], notes["notes"]
+
+    # Core statements outside AppSession do not bump the generation by themselves...
+    with app_module.engine.begin() as conn:
+        conn.execute(update(CTScanCenter).where(CTScanCenter.id == center_id).values(notes="core write"))
+    assert client.get("/api/centers").json()[0]["notes"] == original
+
+    # ...so writers such as seed_database bump it in the same transaction.
+    try:
+        with app_module.engine.begin() as conn:
+            conn.execute(update(CacheGeneration).values(generation=CacheGeneration.generation + 1))
+        assert client.get("/api/centers").json()[0]["notes"] == "core write"
+    finally:
+        with app_module.engine.begin() as conn:
+            conn.execute(update(CTScanCenter).where(CTScanCenter.id == center_id).values(notes=original))
+            conn.execute(update(CacheGeneration).values(generation=CacheGeneration.generation + 1))
@@ -0,0 +1,70 @@
+from geo_grid import encode_geohash, geohash_precision_for_zoom
+from spatial import bounding_box, haversine_km
+
+
+def test_haversine_pune_to_mumbai():
+    assert 115 < haversine_km(18.5204, 73.8567, 19.0760, 72.8777) < 125
+
+
+def test_bounding_box_contains_radius():
+    min_lat, min_lng, max_lat, max_lng = bounding_box(18.5, 73.8, 10)
+    assert haversine_km(18.5, 73.8, max_lat, 73.8) >= 9.99
+    assert haversine_km(18.5, 73.8, 18.5, max_lng) >= 9.99
+    assert min_lat < 18.5 < max_lat and min_lng < 73.8 < max_lng
+
+
+def test_nearby_returns_only_centers_within_radius_sorted(client):
+    centers = client.get("/api/centers/nearby", params={"lat": 18.52, "lng": 73.85, "radius_km": 10}).json()
+    assert centers
+    assert all(center["city"] == "Pune" for center in centers)
+    distances = [center["distance_km"] for center in centers]
+    assert distances == sorted(distances) and distances[-1] <= 10
+
+
+def test_spatial_index_follows_coordinate_changes(app_module, client):
+    # A center of its own, so the shared seed stays untouched for other tests.
+    db = app_module.SessionLocal()
+    center = app_module.CTScanCenter(
+        center_name="Spatial Test Centre", address="Police Bazaar, Shillong", city="Shillong",
+        stored_state="Meghalaya", latitude=25.5788, longitude=91.8933,
+    )
+    db.add(center)
+    db.commit()
+    center_id = center.id
+    db.close()
+
+    near_shillong = {"lat": 25.57, "lng": 91.89, "radius_km": 5, "fields": "id"}
+    assert [c["id"] for c in client.get("/api/centers/nearby", params=near_shillong).json()] == [center_id]
+
+    client.patch(f"/api/centers/{center_id}", json={"address": "Somewhere in Pune"})
+    assert center_id not in [c["id"] for c in client.get("/api/centers/nearby", params=near_shillong).json()]
+
+    near_pune = {"lat": 18.5204, "lng": 73.8567, "radius_km": 1, "fields": "id"}
+    assert center_id in [c["id"] for c in client.get("/api/centers/nearby", params=near_pune).json()]
+
+    client.delete(f"/api/centers/{center_id}")
+    assert center_id not in [c["id"] for c in client.get("/api/centers/nearby", params=near_pune).json()]
+
+
+def test_in_bbox_rejects_malformed_box(client):
+    assert client.get("/api/centers/in-bbox", params={"bbox": "1,2,3"}).status_code == 400
+
+
+def test_geohash_known_value_and_zoom_precision():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geohash_precision_for_zoom(0) == 1
+    assert geohash_precision_for_zoom(10) == 5
+
+
+def test_map_clusters_cover_centers_and_split_with_zoom(client):
+    located = [c for c in client.get("/api/centers").json() if c["latitude"] is not None]
+    country = client.get("/api/map/clusters", params={"zoom": 4}).json()["clusters"]
+    assert sum(cluster["count"] for cluster in country) == len(located)
+    assert sum(cluster["validated"] for cluster in country) == sum(c["validated"] for c in located)
+
+    street = client.get("/api/map/clusters", params={"zoom": 16}).json()["clusters"]
+    assert len(street) > len(country)
+    assert all(cluster["center_id"] is not None for cluster in street if cluster["count"] == 1)
+
+    pune = client.get("/api/map/clusters", params={"zoom": 4, "bbox": "73,18,74.5,19"}).json()["clusters"]
+    assert pune and all(18 <= cluster["latitude"] <= 19 for cluster in pune)
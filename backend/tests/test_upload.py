@@ -0,0 +1,186 @@
+import io
+import os
+import time
+import zipfile
+
+HEADER = "Center Name,Address,Contact Details,Google Maps Link,Notes\n"
+
+
+def _csv(*rows):
+    return (HEADER + "".join(f"{name},{address},020 1111 2222,https://maps.google.com/?q=x,\n" for name, address in rows)).encode()
+
+
+def _zip(**members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_batch_upload_geocodes_shared_addresses_once(app_module, client, monkeypatch):
+    looked_up = []
+
+    async def fake_geocode_many(addresses, use_cache=True):
+        looked_up.extend(addresses)
+        return [app_module.Location("Sangli", "Maharashtra", 16.85, 74.58) for _ in addresses]
+
+    monkeypatch.setattr(app_module, "geocode_many", fake_geocode_many)
+    files = [
+        ("files", ("batch_a.csv", _csv(("A1", "1 Market Yard Sangli"), ("A2", "2 Station Road Sangli")), "text/csv")),
+        ("files", ("batch_b.zip", _zip(**{
+            "nested/batch_b.csv": _csv(("B1", "1 MARKET YARD  Sangli"), ("B2", "")),
+            "batch_c.csv": b"Name,Street\nx,y\n",
+        }), "application/zip")),
+    ]
+    before = len(client.get("/api/centers").json())
+    response = client.post("/api/upload/batch", files=files)
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["inserted_count"] == 3
+    assert report["distinct_addresses"] == 2
+    assert sorted(looked_up) == ["1 Market Yard Sangli", "2 Station Road Sangli"]
+    by_name = {entry["filename"]: entry for entry in report["files"]}
+    assert by_name["batch_a.csv"] == {"filename": "batch_a.csv", "rows": 2, "skipped_rows": 0}
+    assert by_name["batch_b.csv"] == {"filename": "batch_b.csv", "rows": 1, "skipped_rows": 1}
+    assert by_name["batch_c.csv"]["error"].startswith("Missing columns")
+    assert len(client.get("/api/centers").json()) == before + 3
+
+    again = client.post("/api/upload/batch", files=files[:1])
+    assert again.status_code == 400
+    assert "already been uploaded" in again.json()["detail"]["files"][0]["error"]
+
+
+def test_batch_upload_reports_unreadable_archives_and_size_limit(app_module, client, monkeypatch):
+    damaged = io.BytesIO()
+    with zipfile.ZipFile(damaged, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("damaged.csv", _csv(*[(f"D{i}", f"{i} Damaged Street Pune") for i in range(50)]))
+    damaged = bytearray(damaged.getvalue())
+    member_data = damaged.index(b"damaged.csv") + len("damaged.csv")
+    damaged[member_data + 5:member_data + 15] = b"\xff" * 10
+
+    response = client.post("/api/upload/batch", files=[
+        ("files", ("damaged.zip", bytes(damaged), "application/zip")),
+        ("files", ("intact.csv", _csv(("I1", "1 Intact Street Pune")), "text/csv")),
+    ])
+    assert response.status_code == 200, response.text
+    by_name = {entry["filename"]: entry for entry in response.json()["files"]}
+    assert by_name["damaged.zip"]["error"].startswith("Could not read archive")
+    assert by_name["intact.csv"]["rows"] == 1
+
+    monkeypatch.setattr(app_module, "UPLOAD_MAX_BYTES", 100)
+    too_large = client.post("/api/upload/batch", files=[("files", ("large.csv", _csv(("L1", "1 Large Street Pune")) * 2))])
+    assert too_large.status_code == 400 and "larger than 100 bytes" in too_large.json()["detail"]
+
+
+def _wait_for_rows(client, upload_id, rows):
+    for _ in range(100):
+        state = client.get(f"/api/uploads/{upload_id}").json()
+        if state["ingested_rows"] >= rows:
+            return state
+        time.sleep(0.02)
+    raise AssertionError(f"ingestion stalled at {state}")
+
+
+def test_chunked_upload_ingests_while_receiving(app_module, client):
+    data = _csv(*[(f"C{i}", f"Chunk Road {i} Pune") for i in range(20)])
+    data = data.replace(b"Chunk Road 0 Pune", b'"Chunk Road 0,\nPune"')  # a record spanning two lines
+    created = client.post("/api/uploads", json={"filename": "chunked.csv", "size": len(data)})
+    assert created.status_code == 201
+    upload_id = created.json()["upload_id"]
+    url = f"/api/uploads/{upload_id}"
+
+    chunk = 100
+    for offset in range(0, len(data) - chunk, chunk):
+        assert client.put(url, params={"offset": offset}, content=data[offset:offset + chunk]).status_code == 200
+    last = (len(data) - 1) // chunk * chunk
+    # Rows are inserted before the upload is complete.
+    partial = _wait_for_rows(client, upload_id, 10)
+    assert partial["offset"] == last
+    assert client.post(f"{url}/finalize").status_code == 409
+
+    # A resent chunk is accepted; one that leaves a gap is not.
+    assert client.put(url, params={"offset": chunk}, content=data[chunk:2 * chunk]).json()["offset"] == last
+    gap = client.put(url, params={"offset": last + 1}, content=data[last + 1:])
+    assert gap.status_code == 409 and gap.json()["detail"]["offset"] == last
+    assert client.put(url, params={"offset": last}, content=data[last:]).json()["offset"] == len(data)
+
+    finished = client.post(f"{url}/finalize")
+    assert finished.status_code == 200, finished.text
+    assert finished.json()["status"] == "complete"
+    assert finished.json()["ingested_rows"] == 20
+    addresses = {center["address"] for center in client.get("/api/centers").json()}
+    assert "Chunk Road 0,\nPune" in addresses and "Chunk Road 19 Pune" in addresses
+    assert not os.path.exists(app_module._upload_path(upload_id))
+    assert client.post("/api/uploads", json={"filename": "chunked.csv", "size": 1}).status_code == 409
+
+
+def test_chunked_upload_follows_csv_quoting(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module, "UPLOAD_SEGMENT_BYTES", 200)
+    rows = [(f"Q{i}", f"Quote Lane {i} Pune") for i in range(30)]
+    rows[3] = ("Q3", 'Opp. 5" Pipe Lane Pune')  # a quote mid-field is an ordinary character
+    rows[10] = ("Q10", '"' + "Long Road, " * 40 + 'Pune"')  # one record longer than a segment
+    data = _csv(*rows)
+    upload_id = client.post("/api/uploads", json={"filename": "quoting.csv", "size": len(data)}).json()["upload_id"]
+    url = f"/api/uploads/{upload_id}"
+    for offset in range(0, len(data), 150):
+        assert client.put(url, params={"offset": offset}, content=data[offset:offset + 150]).status_code == 200
+
+    finished = client.post(f"{url}/finalize")
+    assert finished.status_code == 200, finished.text
+    assert finished.json()["ingested_rows"] == 30
+    assert finished.json()["ingested_offset"] == len(data)
+    addresses = {center["address"] for center in client.get("/api/centers").json()}
+    assert 'Opp. 5" Pipe Lane Pune' in addresses and "Quote Lane 29 Pune" in addresses
+
+
+def test_chunked_upload_records_ingestion_errors(app_module, client, monkeypatch):
+    async def failing_geocode_many(addresses, use_cache=True):
+        raise RuntimeError("geocoder unavailable")
+
+    monkeypatch.setattr(app_module, "geocode_many", failing_geocode_many)
+    data = _csv(("E1", "1 Error Street Pune"))
+    upload_id = client.post("/api/uploads", json={"filename": "errors.csv", "size": len(data)}).json()["upload_id"]
+    url = f"/api/uploads/{upload_id}"
+    client.put(url, params={"offset": 0}, content=data)
+    for _ in range(100):
+        state = client.get(url).json()
+        if state["status"] != "receiving":
+            break
+        time.sleep(0.02)
+    assert state["status"] == "failed"
+    assert "geocoder unavailable" in state["error"]
+    assert upload_id not in app_module._upload_locks
+    assert client.post(f"{url}/finalize").status_code == 400
+
+
+def test_chunked_upload_reserves_its_filename(client):
+    data = _csv(("R1", "1 Reserved Road Pune"))
+    first = client.post("/api/uploads", json={"filename": "reserved.csv", "size": len(data)})
+    assert first.status_code == 201
+    second = client.post("/api/uploads", json={"filename": "reserved.csv", "size": len(data)})
+    assert second.status_code == 409 and "already being uploaded" in second.json()["detail"]
+
+    batch = client.post("/api/upload/batch", files=[("files", ("reserved.csv", data, "text/csv"))])
+    assert batch.status_code == 400
+    assert "being uploaded in chunks" in batch.json()["detail"]["files"][0]["error"]
+
+    # Discarding the upload releases the name.
+    assert client.delete(f"/api/uploads/{first.json()['upload_id']}").status_code == 200
+    assert client.post("/api/uploads", json={"filename": "reserved.csv", "size": len(data)}).status_code == 201
+
+
+def test_finalize_refuses_a_filename_recorded_meanwhile(app_module, client):
+    data = _csv(("F1", "1 Finalize Road Pune"))
+    upload_id = client.post("/api/uploads", json={"filename": "recorded.csv", "size": len(data)}).json()["upload_id"]
+    url = f"/api/uploads/{upload_id}"
+    client.put(url, params={"offset": 0}, content=data)
+    with app_module.SessionLocal() as db:  # e.g. the single-file /api/upload
+        db.add(app_module.UploadedFile(filename="recorded.csv"))
+        db.commit()
+
+    response = client.post(f"{url}/finalize")
+    assert response.status_code == 409
+    state = client.get(url).json()
+    assert state["status"] == "failed" and "already been uploaded" in state["error"]
@@ -817,10 +817,13 @@ function App() {
         <Modal.Footer>
           <Button variant="secondary" onClick={() => setShowDeleteModal(false)}>Cancel</Button>
           <Button variant="danger" onClick={async () => {
-            for (const centerId of selectedForDeletion) {
-              try { await axios.delete(`${API_BASE_URL}/api/centers/${centerId}`); } catch (error) { console.error(`Error deleting center ${centerId}:`, error); }
+            try {
+              const response = await axios.post(`${API_BASE_URL}/api/centers/bulk-delete`, { ids: [...selectedForDeletion] });
+              alert(`${response.data.deleted_count} centers deleted successfully.`);
+            } catch (error) {
+              console.error('Error deleting selected centers:', error);
+              alert('Error deleting selected centers');
             }
-            alert(`${selectedForDeletion.size} centers deleted successfully.`);
             setSelectedForDeletion(new Set());
             setShowDeleteModal(false);
             fetchCenters();